@@ -0,0 +1,174 @@
+'''
+Exact product of integer matrices, without falling back to slow `dtype=object` arithmetic.
+
+The naive product on int64 storage silently overflows when the elements are big (e.g. the 32 bit
+`'random'` matrices), while Python integers are exact but each operation goes through the
+interpreter. Instead, the largest possible element of the result is bounded first:
+- If the bound is below 2^53 the product is computed with float64 (BLAS), where every partial sum
+  is an exactly representable integer.
+- If it is below 2^63 the product is computed with native int64 loops.
+- Otherwise the product is computed modulo several primes below 2^21, again with float64 products
+  (splitting the inner dimension so that partial sums stay below 2^53), and the results are
+  recombined with the Chinese Remainder Theorem (Garner's algorithm). Enough primes are used for
+  their product to exceed twice the bound, so the result, with sign, is exact.
+'''
+
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import numpy
+
+from numbers import Integral
+from typing import List
+
+from .matrix import Matrix
+
+_FLOAT_LIMIT = 2 ** 53
+'''Integers below this are exact in float64.'''
+
+_PRIME_LIMIT = 2 ** 21
+'''Primes are below this, so a product of two residues is below 2^42.'''
+
+_BLOCK = _FLOAT_LIMIT // _PRIME_LIMIT ** 2
+'''Length of the inner dimension slices, so that float64 partial sums stay exact.'''
+
+_primes: List[int] = list()
+'''Primes below `_PRIME_LIMIT`, biggest first, found when needed.'''
+
+
+def matrix_product_exact(A: Matrix, B: Matrix) -> Matrix:
+    '''
+    Exact product of two integer matrices.
+
+    Returns:
+        Matrix : The product, with int64 content if every element fits, Python ints otherwise.
+
+    Raises:
+        ValueError : if A.columns != B.rows.
+        TypeError : if the matrices do not contain integers.
+    '''
+    if A.columns != B.rows:
+        raise ValueError(f"A.columns ({A.columns}) != B.rows ({B.rows}).")
+
+    a = _integers(A)
+    b = _integers(B)
+    bound = A.columns * _max_abs(a) * _max_abs(b)
+    int64_max = numpy.iinfo(numpy.int64).max
+
+    if bound < _FLOAT_LIMIT:
+        product = numpy.matmul(a.astype(numpy.float64), b.astype(numpy.float64))
+        return Matrix._wrap(product.astype(numpy.int64))
+    if bound <= int64_max:
+        return Matrix._wrap(numpy.matmul(a.astype(numpy.int64), b.astype(numpy.int64)))
+
+    primes = list()
+    modulus = 1
+    for prime in _iter_primes():
+        if modulus > 2 * bound:
+            break
+        primes.append(prime)
+        modulus *= prime
+
+    residues = [_product_modulo(a, b, p) for p in primes]
+    product = _garner(residues, primes)
+    # Residues are in [0, modulus), values above half of it are negative.
+    product = numpy.where(product > modulus // 2, product - modulus, product)
+    if all(-int64_max - 1 <= x <= int64_max for x in product.flat):
+        return Matrix._wrap(product.astype(numpy.int64))
+    return Matrix._wrap(product)
+
+
+def _integers(A: Matrix) -> numpy.ndarray:
+    '''
+    Returns:
+        numpy.ndarray : The content of A, as an integer array or an object array of Python ints.
+
+    Raises:
+        TypeError : if A does not contain integers.
+    '''
+    array = A[:, :]
+    if array.dtype.kind in 'iub':
+        return array
+    if array.dtype.hasobject and all(isinstance(x, (Integral, numpy.integer)) for x in array.flat):
+        return numpy.frompyfunc(int, 1, 1)(array).astype(object)
+    raise TypeError("Exact products need integer matrices.")
+
+
+def _max_abs(array: numpy.ndarray) -> int:
+    '''
+    Returns:
+        int : The biggest absolute value in the array as a Python int, 0 if empty.
+    '''
+    if not array.size:
+        return 0
+    return max(-int(array.min()), int(array.max()))
+
+
+def _iter_primes():
+    '''
+    Yields the primes below `_PRIME_LIMIT`, biggest first.
+    '''
+    for prime in _primes:
+        yield prime
+    candidate = _primes[-1] - 2 if _primes else _PRIME_LIMIT - 1
+    while candidate > 2:
+        if all(candidate % d for d in range(3, int(candidate ** 0.5) + 1, 2)):
+            _primes.append(candidate)
+            yield candidate
+        candidate -= 2
+    raise ValueError("Result too big for the available primes.")
+
+
+def _product_modulo(a: numpy.ndarray, b: numpy.ndarray, prime: int) -> numpy.ndarray:
+    '''
+    Returns:
+        numpy.ndarray : `(a @ b) % prime` as int64, computed with float64 products.
+    '''
+    a = numpy.remainder(a, prime).astype(numpy.float64)
+    b = numpy.remainder(b, prime).astype(numpy.float64)
+    result = numpy.zeros((a.shape[0], b.shape[1]), dtype=numpy.int64)
+    for start in range(0, a.shape[1], _BLOCK):
+        block = numpy.matmul(a[:, start:start + _BLOCK], b[start:start + _BLOCK])
+        result += block.astype(numpy.int64)
+        numpy.remainder(result, prime, out=result)
+    return result
+
+
+def _garner(residues: List[numpy.ndarray], primes: List[int]) -> numpy.ndarray:
+    '''
+    Chinese Remainder Theorem with Garner's algorithm: the mixed radix digits are computed with
+    int64 operations, only the final recombination uses Python ints.
+
+    Returns:
+        numpy.ndarray : Object array with the values in `[0, product of the primes)` congruent to
+        the residues.
+    '''
+    digits = list()
+    for i, (residue, prime) in enumerate(zip(residues, primes)):
+        digit = residue.copy()
+        for previous, previous_prime in zip(digits, primes[:i]):
+            inverse = _inverse(previous_prime, prime)
+            digit = ((digit - previous) % prime) * inverse % prime
+        digits.append(digit)
+
+    # Horner's scheme over the mixed radix representation.
+    result = digits[-1].astype(object)
+    for digit, prime in zip(reversed(digits[:-1]), reversed(primes[:-1])):
+        result = result * prime + digit.astype(object)
+    return result
+
+
+def _inverse(value: int, modulus: int) -> int:
+    '''
+    Modular inverse with the extended Euclidean algorithm (`pow(value, -1, modulus)` needs Python
+    3.8).
+
+    Returns:
+        int : x in `[0, modulus)` such that `value * x % modulus == 1`.
+    '''
+    old_remainder, remainder = value % modulus, modulus
+    old_x, x = 1, 0
+    while remainder:
+        quotient = old_remainder // remainder
+        old_remainder, remainder = remainder, old_remainder - quotient * remainder
+        old_x, x = x, old_x - quotient * x
+    return old_x % modulus
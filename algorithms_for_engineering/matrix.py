@@ -1,6 +1,9 @@
 '''
 Small 2D matrix class to wrap numpy arrays in order to have to implement things myself.
 '''
+import math
+import operator
+import pickle
 import numpy
 import numpy.random
 from typing import Union
@@ -34,6 +37,94 @@ class Matrix():
 
         self._rows = rows
         self._columns = columns
+        # Last content hash computed by `product_cache`.
+        self._digest = None
+
+    @classmethod
+    def _wrap(cls, array: numpy.ndarray) -> 'Matrix':
+        '''
+        Create a Matrix using a 2D array as its content, without copying it.
+        '''
+        matrix = cls.__new__(cls)
+        matrix._matrix = array
+        matrix._rows, matrix._columns = array.shape
+        matrix._digest = None
+        return matrix
+
+    @classmethod
+    def from_buffer(
+        cls,
+        buffer,
+        rows: int,
+        columns: int,
+        dtype: Union[numpy.dtype, str] = 'int64'
+    ) -> 'Matrix':
+        '''
+        Create a Matrix on top of an existing buffer (bytes, bytearray, memoryview, shared memory,
+        mmap...), without copying it. Changes to the Matrix are visible in the buffer and vice
+        versa, read-only buffers give read-only matrices.
+
+        Parameters:
+            buffer : buffer
+                Any object supporting the buffer protocol, holding at least `rows * columns` values
+                in row-major order.
+
+            rows : int
+                Number of rows.
+
+            columns : int
+                Number of columns.
+
+            dtype : Union[numpy.dtype, str]
+                Type of the values in the buffer, must not be object.
+
+        Returns:
+            Matrix : The Matrix using the buffer as content.
+
+        Raises:
+            ValueError : if the buffer is too small or the type is object.
+        '''
+        if numpy.dtype(dtype).hasobject:
+            raise ValueError("Buffers cannot hold object values.")
+        array = numpy.frombuffer(buffer, dtype=dtype, count=rows * columns)
+        return cls._wrap(array.reshape(rows, columns))
+
+    def __array__(self, dtype=None, copy=None) -> numpy.ndarray:
+        '''
+        NumPy interface: `numpy.asarray(matrix)` returns the content without copying it.
+        '''
+        if copy:
+            return numpy.array(self._matrix, dtype=dtype, copy=True)
+        if dtype is None or numpy.dtype(dtype) == self._matrix.dtype:
+            return self._matrix
+        if copy is False:
+            raise ValueError("Cannot change the type of a Matrix without copying it.")
+        return self._matrix.astype(dtype)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        '''
+        Buffer protocol (Python 3.12+): `memoryview(matrix)` exposes the content without copying
+        it. On older versions use `memoryview(numpy.asarray(matrix))`.
+
+        Raises:
+            TypeError : if the content is of object type.
+        '''
+        if self._matrix.dtype.hasobject:
+            raise TypeError("Matrices of objects do not support the buffer protocol.")
+        return memoryview(self._matrix)
+
+    def __release_buffer__(self, view: memoryview):
+        view.release()
+
+    def __reduce_ex__(self, protocol: int):
+        '''
+        With pickle protocol 5 and typed content, the content is pickled as a `PickleBuffer`, so it
+        can be transferred out-of-band (`buffer_callback`) without copies. Otherwise, the default.
+        '''
+        if protocol < 5 or self._matrix.dtype.hasobject:
+            return super().__reduce_ex__(protocol)
+        array = numpy.ascontiguousarray(self._matrix)
+        return _from_pickle_buffer, (pickle.PickleBuffer(array), array.dtype.str, *array.shape)
 
     def __getitem__(self, index):
         return self._matrix[index]
@@ -41,6 +132,20 @@ class Matrix():
     def __setitem__(self, index, value):
         self._matrix[index] = value
 
+    def __add__(self, other):
+        '''
+        Lazy sum, see `matrix_expression`.
+        '''
+        from .matrix_expression import as_expression
+        return as_expression(self) + other
+
+    def __matmul__(self, other):
+        '''
+        Lazy product, see `matrix_expression`.
+        '''
+        from .matrix_expression import as_expression
+        return as_expression(self) @ other
+
     @property
     def rows(self) -> int:
         return self._rows
@@ -50,6 +155,13 @@ class Matrix():
         return self._columns
 
 
+def _from_pickle_buffer(buffer, dtype: str, rows: int, columns: int) -> Matrix:
+    '''
+    Rebuild a Matrix pickled with protocol 5.
+    '''
+    return Matrix.from_buffer(buffer, rows, columns, dtype)
+
+
 def matrix_sum(A: Matrix, B: Matrix) -> Matrix:
     '''
     Raises:
@@ -78,15 +190,23 @@ def matrix_product_naive(A: Matrix, B: Matrix) -> Matrix:
         raise ValueError(f"A.columns ({A.columns}) != B.rows ({B.rows}).")
 
     C = Matrix(A.rows, B.columns)
-    for i in range(A.rows):
-        for j in range(B.columns):
-            C[i, j] = A[i, 0] * B[0, j]
-            for k in range(1, A.columns):
-                C[i, j] += A[i, k] * B[k, j]
-
+    _product_into(A, B, C, A.rows, A.columns, B.columns)
     return C
 
 
+def _product_into(A, B, C, rows: int, inner: int, columns: int):
+    '''
+    Naive iterative product of A (rows x inner) and B (inner x columns), written into C. Any of
+    them can be a Matrix or a 2D numpy array, C must not be A or B.
+    '''
+    for i in range(rows):
+        for j in range(columns):
+            value = A[i, 0] * B[0, j]
+            for k in range(1, inner):
+                value += A[i, k] * B[k, j]
+            C[i, j] = value
+
+
 def matrix_fractal_product(A: Matrix, B: Matrix) -> Matrix:
     '''
     This algorithm works only on square Matrices of size 2^n for some n.
@@ -132,3 +252,214 @@ def matrix_fractal_product(A: Matrix, B: Matrix) -> Matrix:
     )
 
     return C
+
+
+def matrix_power(A: Matrix, k: int, modulus: int = None) -> Matrix:
+    '''
+    Compute A^k by exponentiation by squaring, with `O(log(k))` products. Intermediate results
+    alternate between preallocated buffers. Without a modulus, integer matrices whose power could
+    overflow int64 are computed with Python ints.
+
+    Parameters:
+        A : Matrix
+            A square Matrix.
+
+        k : int
+            The exponent, A^0 is the identity.
+
+        modulus : int
+            If given, the result is computed modulo this number, exactly. The elements of A must be
+            integers.
+
+    Returns:
+        Matrix : A^k.
+
+    Raises:
+        ValueError : if A is not square, k is negative or the modulus is not positive.
+        TypeError : if k is not an integer.
+    '''
+    k = operator.index(k)
+    if A.rows != A.columns:
+        raise ValueError("Matrix is not squared.")
+
+    n = A.rows
+    base = _power_operand(A, modulus, n)
+    if modulus is None and _overflows(n, k, _largest(base)):
+        base = _python_ints(base)
+    result = Matrix(n, n)
+    result[:, :] = _power(base, k, modulus)
+    return result
+
+
+def matrix_power_product(A: Matrix, k: int, B: Matrix, modulus: int = None) -> Matrix:
+    '''
+    Compute A^k @ B, applying the same power to all the columns of B (e.g. many state vectors).
+    Depending on the sizes, either A^k is computed first or B is multiplied by A k times, whichever
+    takes fewer scalar multiplications. Without a modulus, integer matrices whose result could
+    overflow int64 are computed with Python ints.
+
+    Parameters:
+        A : Matrix
+            A square Matrix.
+
+        k : int
+            The exponent, A^0 is the identity.
+
+        B : Matrix
+            The vectors, one per column.
+
+        modulus : int
+            If given, the result is computed modulo this number, exactly. The elements of A and B
+            must be integers.
+
+    Returns:
+        Matrix : A^k @ B.
+
+    Raises:
+        ValueError : if A is not square, A.columns != B.rows, k is negative or the modulus is not
+        positive.
+        TypeError : if k is not an integer.
+    '''
+    k = operator.index(k)
+    if A.rows != A.columns:
+        raise ValueError("Matrix is not squared.")
+    if A.columns != B.rows:
+        raise ValueError(f"A.columns ({A.columns}) != B.rows ({B.rows}).")
+
+    n = A.rows
+    base = _power_operand(A, modulus, n)
+    vectors = _power_operand(B, modulus, n)
+    dtype = numpy.result_type(base, vectors)
+    base, vectors = base.astype(dtype), vectors.astype(dtype)
+    # Elements of A^k @ B are at most n^k * max|A|^k * max|B|.
+    if modulus is None and _overflows(n, k, _largest(base), n * _largest(vectors)):
+        base, vectors = _python_ints(base), _python_ints(vectors)
+    if k >= 0 and k * n * n * B.columns <= 2 * k.bit_length() * n ** 3:
+        # Applying A k times is cheaper than squaring.
+        kernel = _product_kernel(n, base.dtype)
+        scratch = numpy.empty_like(vectors)
+        for _ in range(k):
+            kernel(base, vectors, scratch)
+            if modulus is not None:
+                numpy.remainder(scratch, modulus, out=scratch)
+            vectors, scratch = scratch, vectors
+        product = vectors
+    else:
+        power = _power(base, k, modulus)
+        product = numpy.empty_like(vectors)
+        _product_kernel(n, base.dtype)(power, vectors, product)
+        if modulus is not None:
+            numpy.remainder(product, modulus, out=product)
+
+    result = Matrix(B.rows, B.columns)
+    result[:, :] = product
+    return result
+
+
+def _power_operand(A: Matrix, modulus: int, size: int) -> numpy.ndarray:
+    '''
+    Copy of the content of A in the type `_power` should work with. Without modulus, integers are
+    widened to int64 (Python ints for uint64 values that do not fit), since narrower types would
+    overflow before the int64 bound checked by the callers, and other types are kept. With a
+    modulus, int64 if no product of matrices of the given size can overflow, Python ints otherwise.
+
+    Raises:
+        ValueError : if the modulus is not positive.
+    '''
+    if modulus is None:
+        array = numpy.array(A[:, :])
+        if array.dtype.kind not in 'iu':
+            return array
+        if _largest(array) > numpy.iinfo(numpy.int64).max:
+            return _python_ints(array)
+        return array.astype(numpy.int64)
+    if modulus < 1:
+        raise ValueError("Modulus must be positive.")
+    if size * (modulus - 1) ** 2 <= numpy.iinfo(numpy.int64).max:
+        return numpy.remainder(numpy.array(A[:, :], dtype=numpy.int64), modulus)
+    return numpy.remainder(_python_ints(A[:, :]), modulus)
+
+
+def _largest(array: numpy.ndarray) -> int:
+    '''
+    Returns:
+        int : The biggest absolute value of an integer array as a Python int, 0 for other types.
+    '''
+    if array.dtype.kind not in 'iu' or not array.size:
+        return 0
+    return max(-int(array.min()), int(array.max()))
+
+
+def _overflows(size: int, k: int, largest: int, factor: int = 1) -> bool:
+    '''
+    Whether `size^(k-1) * largest^k * factor`, a bound for the elements of the k-th power of a
+    matrix of the given size (times `factor`), can be beyond int64. Logarithms first, to avoid
+    computing huge integers for big exponents.
+    '''
+    if k == 0 or largest == 0 or factor == 0:
+        return False
+    bits = (k - 1) * math.log2(size) + k * math.log2(largest) + math.log2(factor)
+    if bits > 64:
+        return True
+    return size ** (k - 1) * largest ** k * factor > numpy.iinfo(numpy.int64).max
+
+
+def _python_ints(array: numpy.ndarray) -> numpy.ndarray:
+    '''
+    Returns:
+        numpy.ndarray : Object array with the elements of the array as Python ints.
+    '''
+    return numpy.frompyfunc(int, 1, 1)(array).astype(object)
+
+
+def _power(base: numpy.ndarray, k: int, modulus: int) -> numpy.ndarray:
+    '''
+    Exponentiation by squaring on a square array, which is overwritten.
+
+    Raises:
+        ValueError : if k is negative.
+    '''
+    if k < 0:
+        raise ValueError("Exponent must not be negative.")
+
+    n = len(base)
+    kernel = _product_kernel(n, base.dtype)
+    result = None
+    scratch = numpy.empty_like(base)
+    while k:
+        if k & 1:
+            if result is None:
+                result = base.copy()
+            else:
+                kernel(result, base, scratch)
+                if modulus is not None:
+                    numpy.remainder(scratch, modulus, out=scratch)
+                result, scratch = scratch, result
+        k >>= 1
+        if k:
+            kernel(base, base, scratch)
+            if modulus is not None:
+                numpy.remainder(scratch, modulus, out=scratch)
+            base, scratch = scratch, base
+
+    if result is None:
+        # A^0, the identity.
+        result = numpy.zeros_like(base)
+        numpy.fill_diagonal(result, 1 if modulus is None else 1 % modulus)
+    return result
+
+
+def _product_kernel(size: int, dtype: numpy.dtype):
+    '''
+    Returns:
+        A function computing `out = a @ b` for square matrices of the given size and type: the naive
+        loop for single elements, avoiding the setup of `numpy.matmul`, which is used otherwise.
+    '''
+    if size == 1:
+        def naive(a, b, out):
+            _product_into(a, b, out, 1, 1, out.shape[1])
+        return naive
+
+    def vectorized(a, b, out):
+        numpy.matmul(a, b, out=out)
+    return vectorized
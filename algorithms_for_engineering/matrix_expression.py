@@ -0,0 +1,277 @@
+'''
+Lazy Matrix expressions: `A @ B @ C + D + E` builds an expression graph instead of computing every
+intermediate Matrix, and `evaluate()` computes it at once.
+
+Products of more than two matrices are computed in the order needing the fewest scalar
+multiplications, found by dynamic programming over the shapes of the factors (matrix chain
+ordering). Sums of any number of terms are computed in a single pass over the elements. Intermediate
+products are stored in buffers that are reused as soon as they are no longer needed, and only the
+final result is allocated as a new Matrix.
+'''
+
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import numpy
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+from .matrix import Matrix, _product_into
+
+Operand = Union[Matrix, numpy.ndarray]
+'''Something an expression can read elements from with `[i, j]`.'''
+
+
+class _BufferPool():
+
+    '''
+    Intermediate buffers, reused by shape.
+    '''
+
+    def __init__(self):
+        self._free: Dict[Tuple[int, int], List[numpy.ndarray]] = dict()
+
+    def acquire(self, shape: Tuple[int, int]) -> numpy.ndarray:
+        '''
+        Returns:
+            numpy.ndarray : A free buffer of the given shape, new if none is available.
+        '''
+        free = self._free.get(shape)
+        return free.pop() if free else numpy.full(shape, 0, dtype=object)
+
+    def release(self, buffer: numpy.ndarray):
+        '''
+        Make a buffer available again.
+        '''
+        self._free.setdefault(buffer.shape, list()).append(buffer)
+
+
+class MatrixExpression():
+
+    '''
+    Base class of the nodes of a lazy expression.
+    '''
+
+    def __init__(self, rows: int, columns: int):
+        '''
+        Parameters:
+            rows : int
+                Number of rows of the result.
+
+            columns : int
+                Number of columns of the result.
+        '''
+        self._rows = rows
+        self._columns = columns
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> int:
+        return self._columns
+
+    def __add__(self, other: Union[Matrix, 'MatrixExpression']) -> 'MatrixExpression':
+        return MatrixSum([self, as_expression(other)])
+
+    def __matmul__(self, other: Union[Matrix, 'MatrixExpression']) -> 'MatrixExpression':
+        return MatrixProduct([self, as_expression(other)])
+
+    def evaluate(self) -> Matrix:
+        '''
+        Compute the expression.
+
+        Returns:
+            Matrix : The result, the only Matrix allocated.
+        '''
+        result = Matrix(self.rows, self.columns)
+        self._evaluate_into(result, _BufferPool())
+        return result
+
+    def _evaluate(self, pool: _BufferPool) -> Tuple[Operand, bool]:
+        '''
+        Compute the expression into a buffer from the pool.
+
+        Returns:
+            Tuple[Operand, bool] : The result and whether it is a buffer to release to the pool.
+        '''
+        buffer = pool.acquire((self.rows, self.columns))
+        self._evaluate_into(buffer, pool)
+        return buffer, True
+
+    def _evaluate_into(self, out: Operand, pool: _BufferPool):
+        '''
+        Compute the expression, writing it into `out`.
+        '''
+        raise NotImplementedError("This is an Abstract class, please extend it.")
+
+
+class MatrixLeaf(MatrixExpression):
+
+    '''
+    A Matrix as part of an expression.
+    '''
+
+    def __init__(self, matrix: Matrix):
+        '''
+        Parameters:
+            matrix : Matrix
+                The wrapped Matrix, read when the expression is evaluated.
+        '''
+        super().__init__(matrix.rows, matrix.columns)
+        self.matrix = matrix
+
+    def _evaluate(self, pool: _BufferPool) -> Tuple[Operand, bool]:
+        return self.matrix, False
+
+    def _evaluate_into(self, out: Operand, pool: _BufferPool):
+        for i in range(self.rows):
+            for j in range(self.columns):
+                out[i, j] = self.matrix[i, j]
+
+
+class MatrixSum(MatrixExpression):
+
+    '''
+    Sum of any number of terms, computed in a single pass.
+    '''
+
+    def __init__(self, terms: Sequence[MatrixExpression]):
+        '''
+        Parameters:
+            terms : Sequence[MatrixExpression]
+                The terms, nested sums are flattened.
+
+        Raises:
+            ValueError : if the sizes of the terms are different.
+        '''
+        flat = list()
+        for term in terms:
+            flat.extend(term.terms if isinstance(term, MatrixSum) else [term])
+        first = flat[0]
+        if any(t.rows != first.rows or t.columns != first.columns for t in flat):
+            raise ValueError("Matrices must have the same size.")
+
+        super().__init__(first.rows, first.columns)
+        self.terms = flat
+
+    def _evaluate_into(self, out: Operand, pool: _BufferPool):
+        operands = [term._evaluate(pool) for term in self.terms]
+        values = [operand for operand, _ in operands]
+        first, rest = values[0], values[1:]
+        for i in range(self.rows):
+            for j in range(self.columns):
+                value = first[i, j]
+                for operand in rest:
+                    value = value + operand[i, j]
+                out[i, j] = value
+        for operand, owned in operands:
+            if owned:
+                pool.release(operand)
+
+
+class MatrixProduct(MatrixExpression):
+
+    '''
+    Product of a chain of factors, computed in the cheapest order.
+    '''
+
+    def __init__(self, factors: Sequence[MatrixExpression]):
+        '''
+        Parameters:
+            factors : Sequence[MatrixExpression]
+                The factors, nested products are flattened.
+
+        Raises:
+            ValueError : if the columns of a factor are not the rows of the next one.
+        '''
+        flat = list()
+        for factor in factors:
+            flat.extend(factor.factors if isinstance(factor, MatrixProduct) else [factor])
+        for A, B in zip(flat, flat[1:]):
+            if A.columns != B.rows:
+                raise ValueError(f"A.columns ({A.columns}) != B.rows ({B.rows}).")
+
+        super().__init__(flat[0].rows, flat[-1].columns)
+        self.factors = flat
+        self._dimensions = [flat[0].rows] + [f.columns for f in flat]
+
+    def cost(self) -> int:
+        '''
+        Returns:
+            int : Number of scalar multiplications of the chosen order, without the factors' own.
+        '''
+        return chain_order(self._dimensions)[0]
+
+    def _evaluate_into(self, out: Operand, pool: _BufferPool):
+        split = chain_order(self._dimensions)[1]
+        operands = [factor._evaluate(pool) for factor in self.factors]
+        dimensions = self._dimensions
+
+        def multiply(i: int, j: int, target: Operand = None) -> Tuple[Operand, bool]:
+            # Product of factors i to j, both included.
+            if i == j:
+                return operands[i]
+            k = split[i][j]
+            left, left_owned = multiply(i, k)
+            right, right_owned = multiply(k + 1, j)
+            owned = target is None
+            if owned:
+                target = pool.acquire((dimensions[i], dimensions[j + 1]))
+            _product_into(left, right, target, dimensions[i], dimensions[k + 1], dimensions[j + 1])
+            # Intermediate results are not needed anymore, their buffers can be reused.
+            if left_owned:
+                pool.release(left)
+            if right_owned:
+                pool.release(right)
+            return target, owned
+
+        multiply(0, len(operands) - 1, out)
+
+
+def as_expression(value: Union[Matrix, MatrixExpression]) -> MatrixExpression:
+    '''
+    Parameters:
+        value : Union[Matrix, MatrixExpression]
+            A Matrix or an expression.
+
+    Returns:
+        MatrixExpression : The value itself if it is an expression, otherwise a leaf wrapping it.
+
+    Raises:
+        TypeError : if the value is neither a Matrix nor an expression.
+    '''
+    if isinstance(value, MatrixExpression):
+        return value
+    if isinstance(value, Matrix):
+        return MatrixLeaf(value)
+    raise TypeError(f"Cannot use {type(value).__name__} in a Matrix expression.")
+
+
+def chain_order(dimensions: Sequence[int]) -> Tuple[int, List[List[int]]]:
+    '''
+    Find the cheapest order for a chain of products, with dynamic programming.
+
+    Parameters:
+        dimensions : Sequence[int]
+            Factor `i` has size `dimensions[i] x dimensions[i + 1]`.
+
+    Returns:
+        Tuple[int, List[List[int]]] : The minimum number of scalar multiplications, and the table of
+        splits: the product of factors `i` to `j` is best computed as `(i..k) @ (k+1..j)` with
+        `k = split[i][j]`.
+    '''
+    n = len(dimensions) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length - 1
+            cost[i][j] = None
+            for k in range(i, j):
+                candidate = cost[i][k] + cost[k + 1][j] + \
+                    dimensions[i] * dimensions[k + 1] * dimensions[j + 1]
+                if cost[i][j] is None or candidate < cost[i][j]:
+                    cost[i][j] = candidate
+                    split[i][j] = k
+    return cost[0][n - 1], split
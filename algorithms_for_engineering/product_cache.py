@@ -0,0 +1,187 @@
+'''
+Opt-in cache for the results of expensive Matrix products, addressed by the content of the
+operands.
+
+The key of a product is the product function itself and a hash of each operand's content, shape and
+type, so the same product is never computed twice, whichever Matrix objects hold the operands. The
+operands are hashed again on every lookup, since they can be changed in many ways (e.g. through a
+view returned by `Matrix.__getitem__`): hashing is linear in the size of the operands, much cheaper
+than the product itself.
+
+Results are kept in least recently used order, and the oldest are evicted when the total size goes
+over a limit. Cached results are returned as read-only views, so they cannot be corrupted.
+
+```python
+cache = ProductCache(max_bytes=2 ** 26)
+product = cache.cached(matrix_product_naive)
+C = product(A, B)  # Computed.
+C = product(A, B)  # From the cache.
+```
+'''
+
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import functools
+import hashlib
+import pickle
+import sys
+import numpy
+
+from collections import OrderedDict
+from typing import Callable, Dict
+
+from .matrix import Matrix
+
+ProductFunction = Callable[[Matrix, Matrix], Matrix]
+'''A function multiplying two matrices, like `matrix_product_naive`.'''
+
+
+class ProductCache():
+
+    '''
+    Least recently used cache of Matrix products, bounded by the total size of the results.
+    '''
+
+    def __init__(self, max_bytes: int = 2 ** 26):
+        '''
+        Parameters:
+            max_bytes : int
+                Maximum total size of the cached results, 64 MiB by default.
+
+        Raises:
+            ValueError : if max_bytes is negative.
+        '''
+        if max_bytes < 0:
+            raise ValueError("Maximum size must not be negative.")
+
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def product(self, function: ProductFunction, A: Matrix, B: Matrix) -> Matrix:
+        '''
+        Compute `function(A, B)`, or take it from the cache.
+
+        Parameters:
+            function : ProductFunction
+                The product function.
+
+            A : Matrix
+                The first operand.
+
+            B : Matrix
+                The second operand.
+
+        Returns:
+            Matrix : The product, read-only.
+        '''
+        # The function itself is part of the key, so lambdas and closures with the same name
+        # are different products, and it is kept alive as long as its results.
+        key = (function, digest(A), digest(B))
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return Matrix._wrap(entry[0].view())
+
+        self.misses += 1
+        result = function(A, B)._matrix
+        result.flags.writeable = False
+        size = _size(result)
+        if size <= self.max_bytes:
+            self._entries[key] = (result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return Matrix._wrap(result.view())
+
+    def cached(self, function: ProductFunction) -> ProductFunction:
+        '''
+        Parameters:
+            function : ProductFunction
+                The product function.
+
+        Returns:
+            ProductFunction : The function, going through this cache.
+        '''
+        # `wraps` skips the attributes the function does not have, like `__name__` for partials.
+        @functools.wraps(function)
+        def cached_product(A: Matrix, B: Matrix) -> Matrix:
+            return self.product(function, A, B)
+        return cached_product
+
+    def invalidate(self, matrix: Matrix):
+        '''
+        Drop the results computed from the content a Matrix had when it was last hashed, to free
+        their memory after the Matrix changed. Not needed for correctness, the Matrix is hashed
+        again on every lookup.
+
+        Parameters:
+            matrix : Matrix
+                The changed Matrix.
+        '''
+        old = matrix._digest
+        matrix._digest = None
+        if old is None:
+            return
+        for key in [key for key in self._entries if old in key[1:]]:
+            _, size = self._entries.pop(key)
+            self._bytes -= size
+
+    def clear(self):
+        '''
+        Drop all the cached results. Statistics are kept.
+        '''
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        '''
+        Returns:
+            Dict[str, int] : Hits, misses, evictions, number of entries and their total size.
+        '''
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._bytes
+        }
+
+
+def digest(matrix: Matrix) -> bytes:
+    '''
+    Hash of the content, shape and type of a Matrix, computed again on every call and remembered
+    as the last hash of the Matrix.
+
+    Parameters:
+        matrix : Matrix
+            The Matrix to hash.
+
+    Returns:
+        bytes : The hash.
+    '''
+    array = matrix._matrix
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(f'{array.dtype.str}{array.shape}'.encode())
+    if array.dtype.hasobject:
+        hasher.update(pickle.dumps(array.tolist(), protocol=pickle.HIGHEST_PROTOCOL))
+    else:
+        hasher.update(numpy.ascontiguousarray(array))
+    matrix._digest = hasher.digest()
+    return matrix._digest
+
+
+def _size(array: numpy.ndarray) -> int:
+    '''
+    Returns:
+        int : Bytes used by the array, including the elements for object arrays.
+    '''
+    if array.dtype.hasobject:
+        return array.nbytes + sum(sys.getsizeof(x) for x in array.flat)
+    return array.nbytes
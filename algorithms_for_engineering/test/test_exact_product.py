@@ -0,0 +1,68 @@
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import unittest
+import numpy.testing
+
+from parameterized import parameterized
+from algorithms_for_engineering.matrix import Matrix
+from algorithms_for_engineering.exact_product import matrix_product_exact
+
+
+def python_ints(A: Matrix) -> numpy.ndarray:
+    '''
+    Content of A as an object array of Python ints, for the slow exact reference.
+    '''
+    return numpy.frompyfunc(int, 1, 1)(A._matrix).astype(object)
+
+
+class TestExactProduct(unittest.TestCase):
+
+    @parameterized.expand([[1, 1, 1], [10, 10, 10], [7, 33, 5], [3, 3000, 2]])
+    def test_random(self, n: int, m: int, p: int):
+        '''
+        The 32 bit random matrices can overflow int64 as soon as m > 1, compare with Python ints.
+        '''
+        A, B = Matrix(n, m, 'random'), Matrix(m, p, 'random')
+        result = matrix_product_exact(A, B)
+        numpy.testing.assert_array_equal(result._matrix, python_ints(A) @ python_ints(B))
+
+    @parameterized.expand([[2 ** 10], [2 ** 20], [2 ** 30]])
+    def test_fits_int64(self, limit: int):
+        '''
+        Results that fit are returned as int64.
+        '''
+        A, B = Matrix(6, 4), Matrix(4, 5)
+        A[:, :] = numpy.random.randint(-limit, limit, (6, 4))
+        B[:, :] = numpy.random.randint(-limit, limit, (4, 5))
+        result = matrix_product_exact(A, B)
+        self.assertEqual(result._matrix.dtype, numpy.int64)
+        numpy.testing.assert_array_equal(result._matrix, python_ints(A) @ python_ints(B))
+
+    @parameterized.expand([[[1, 1, 1, 1], object], [[1, -1, 1, -1], numpy.int64]])
+    def test_multi_modular_int64(self, signs: list, dtype: type):
+        '''
+        Elements of 2^31 over 4 columns may overflow int64, the result is int64 only if it fits.
+        '''
+        A, B = Matrix(2, 4), Matrix(4, 3)
+        A[:, :] = numpy.full((2, 4), 2 ** 31, dtype=numpy.int64)
+        B[:, :] = numpy.array([[sign * 2 ** 31] * 3 for sign in signs], dtype=numpy.int64)
+        result = matrix_product_exact(A, B)
+        self.assertEqual(result._matrix.dtype, dtype)
+        numpy.testing.assert_array_equal(result._matrix, python_ints(A) @ python_ints(B))
+
+    def test_big_integers(self):
+        '''
+        Python ints beyond 64 bits, with mixed signs.
+        '''
+        A, B = Matrix(3, 4), Matrix(4, 2)
+        A[:, :] = numpy.array([[(-1) ** (i + j) * 7 ** (30 + i * j) for j in range(4)]
+                               for i in range(3)], dtype=object)
+        B[:, :] = numpy.array([[-(3 ** (40 + i)) + j for j in range(2)] for i in range(4)],
+                              dtype=object)
+        numpy.testing.assert_array_equal(matrix_product_exact(A, B)._matrix, A._matrix @ B._matrix)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            matrix_product_exact(Matrix(2, 3), Matrix(2, 3))
+        with self.assertRaises(TypeError):
+            matrix_product_exact(Matrix(2, 2, 0.5), Matrix(2, 2))
@@ -5,6 +5,7 @@ import numpy.testing
 
 from parameterized import parameterized
 from algorithms_for_engineering.matrix import Matrix, matrix_sum, matrix_product_naive, matrix_fractal_product
+from algorithms_for_engineering.matrix import matrix_power, matrix_power_product
 
 
 class TestMatrix(unittest.TestCase):
@@ -35,3 +36,86 @@ class TestMatrix(unittest.TestCase):
         numpy.testing.assert_array_equal(
             matrix_fractal_product(A, B)._matrix, A._matrix @ B._matrix
         )
+
+    @parameterized.expand([[1, 0], [1, 5], [2, 1], [3, 7], [5, 16], [8, 33]])
+    def test_matrix_power(self, n: int, k: int):
+        '''
+        Compares with `numpy.linalg.matrix_power` on small values, which do not overflow.
+        '''
+        A = Matrix(n, n)
+        A[:, :] = numpy.random.randint(-2, 3, (n, n))
+        numpy.testing.assert_array_equal(
+            matrix_power(A, k)._matrix, numpy.linalg.matrix_power(A._matrix, k)
+        )
+
+    @parameterized.expand([[2, 90, 10 ** 9 + 7], [4, 1000, 97], [3, 50, 2 ** 61 - 1], [1, 3, 1]])
+    def test_matrix_power_modulus(self, n: int, k: int, modulus: int):
+        '''
+        Compares with exact Python integers, reduced at the end.
+        '''
+        A = Matrix(n, n, 'random')
+        expected = numpy.frompyfunc(int, 1, 1)(A._matrix).astype(object)
+        power = numpy.identity(n, dtype=int).astype(object)
+        for _ in range(k):
+            power = power @ expected
+        numpy.testing.assert_array_equal(matrix_power(A, k, modulus)._matrix, power % modulus)
+
+        B = Matrix(n, 3, 'random')
+        vectors = numpy.frompyfunc(int, 1, 1)(B._matrix).astype(object)
+        numpy.testing.assert_array_equal(
+            matrix_power_product(A, k, B, modulus)._matrix, (power @ vectors) % modulus
+        )
+
+    @parameterized.expand([[3, 2, 100], [3, 40, 1], [6, 0, 2]])
+    def test_matrix_power_product(self, n: int, k: int, vectors: int):
+        '''
+        Both strategies of `matrix_power_product` match the power followed by a product.
+        '''
+        A, B = Matrix(n, n), Matrix(n, vectors)
+        A[:, :] = numpy.random.randint(-1, 2, (n, n))
+        B[:, :] = numpy.random.randint(-5, 5, (n, vectors))
+        numpy.testing.assert_array_equal(
+            matrix_power_product(A, k, B)._matrix, matrix_power(A, k)._matrix @ B._matrix
+        )
+
+    @parameterized.expand([[1, 3], [3, 2], [4, 5]])
+    def test_matrix_power_overflow(self, n: int, k: int):
+        '''
+        Powers of 32 bit random matrices overflow int64, they must be exact like Python ints.
+        '''
+        A, B = Matrix(n, n, 'random'), Matrix(n, 2, 'random')
+        expected = numpy.frompyfunc(int, 1, 1)(A._matrix).astype(object)
+        power = numpy.identity(n, dtype=int).astype(object)
+        for _ in range(k):
+            power = power @ expected
+        vectors = numpy.frompyfunc(int, 1, 1)(B._matrix).astype(object)
+        numpy.testing.assert_array_equal(matrix_power(A, numpy.int64(k))._matrix, power)
+        numpy.testing.assert_array_equal(
+            matrix_power_product(A, numpy.int32(k), B)._matrix, power @ vectors
+        )
+
+    @parameterized.expand([['int8', 10], ['uint8', 10], ['int32', 2 ** 20], ['uint64', 2 ** 63]])
+    def test_matrix_power_small_types(self, dtype: str, value: int):
+        '''
+        Narrow integer types are widened, the results are exact like with Python ints.
+        '''
+        data = numpy.full((2, 2), value, dtype=dtype)
+        A = Matrix.from_buffer(data.tobytes(), 2, 2, dtype)
+        B = Matrix.from_buffer(data[:, :1].copy().tobytes(), 2, 1, dtype)
+        expected = numpy.full((2, 2), value, dtype=object)
+        numpy.testing.assert_array_equal(matrix_power(A, 2)._matrix, expected @ expected)
+        numpy.testing.assert_array_equal(
+            matrix_power_product(A, 2, B)._matrix, expected @ expected @ expected[:, :1]
+        )
+
+    def test_matrix_power_errors(self):
+        with self.assertRaises(ValueError):
+            matrix_power(Matrix(2, 3), 2)
+        with self.assertRaises(ValueError):
+            matrix_power(Matrix(2, 2), -1)
+        with self.assertRaises(ValueError):
+            matrix_power(Matrix(2, 2), 2, 0)
+        with self.assertRaises(ValueError):
+            matrix_power_product(Matrix(2, 2), 2, Matrix(3, 1))
+        with self.assertRaises(TypeError):
+            matrix_power(Matrix(2, 2), 2.0)
@@ -0,0 +1,68 @@
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import pickle
+import sys
+import unittest
+import numpy.testing
+
+from parameterized import parameterized
+from algorithms_for_engineering.matrix import Matrix
+
+
+class TestMatrixBuffer(unittest.TestCase):
+
+    def test_array(self):
+        '''
+        `numpy.asarray` does not copy, other types and explicit copies do.
+        '''
+        A = Matrix(3, 4, 'random')
+        self.assertIs(numpy.asarray(A), A._matrix)
+        self.assertFalse(numpy.shares_memory(numpy.array(A), A._matrix))
+        numpy.testing.assert_array_equal(numpy.asarray(A, dtype=float), A._matrix.astype(float))
+
+    def test_from_buffer(self):
+        '''
+        The Matrix and the buffer share memory.
+        '''
+        buffer = bytearray(numpy.arange(6, dtype=numpy.float64).tobytes())
+        A = Matrix.from_buffer(buffer, 2, 3, 'float64')
+        self.assertEqual((A.rows, A.columns), (2, 3))
+        A[1, 2] = 42
+        self.assertEqual(numpy.frombuffer(buffer)[5], 42)
+        with self.assertRaises(ValueError):
+            Matrix.from_buffer(bytes(8), 1, 1, object)
+        with self.assertRaises(ValueError):
+            Matrix.from_buffer(bytes(8), 2, 2)
+
+    @unittest.skipIf(sys.version_info < (3, 12), "Buffer protocol for classes needs Python 3.12.")
+    def test_memoryview(self):
+        A = Matrix(2, 2, 'random')
+        view = memoryview(A)
+        self.assertEqual(view.shape, (2, 2))
+        with self.assertRaises(TypeError):
+            memoryview(Matrix(2, 2))
+
+    @parameterized.expand([[Matrix(5, 7, 'random')], [Matrix(1, 1, 'random')]])
+    def test_pickle_out_of_band(self, A: Matrix):
+        '''
+        With protocol 5 the content goes out of band, and is used without copies when loading.
+        '''
+        buffers = list()
+        data = pickle.dumps(A, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 1)
+        self.assertNotIn(A._matrix.tobytes(), data)
+        B = pickle.loads(data, buffers=buffers)
+        numpy.testing.assert_array_equal(B._matrix, A._matrix)
+        self.assertTrue(numpy.shares_memory(B._matrix, A._matrix))
+
+    @parameterized.expand([[protocol] for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1)])
+    def test_pickle_in_band(self, protocol: int):
+        '''
+        Every protocol gives back an equal, writable Matrix, for both typed and object content.
+        '''
+        for A in (Matrix(3, 2, 'random'), Matrix(3, 2, 7)):
+            B = pickle.loads(pickle.dumps(A, protocol=protocol))
+            numpy.testing.assert_array_equal(B._matrix, A._matrix)
+            self.assertEqual(B._matrix.dtype, A._matrix.dtype)
+            B[0, 0] = 1
+            self.assertEqual(B[0, 0], 1)
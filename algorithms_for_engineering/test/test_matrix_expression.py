@@ -0,0 +1,69 @@
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import unittest
+import numpy.testing
+
+from parameterized import parameterized
+from algorithms_for_engineering.matrix import Matrix
+from algorithms_for_engineering.matrix_expression import MatrixProduct, MatrixSum, chain_order
+
+
+def small(rows: int, columns: int) -> Matrix:
+    '''
+    Matrix with small random values, so that neither side of the comparisons overflows int64.
+    '''
+    A = Matrix(rows, columns)
+    A[:, :] = numpy.random.randint(-2, 3, (rows, columns))
+    return A
+
+
+class TestMatrixExpression(unittest.TestCase):
+
+    @parameterized.expand([[3, 7, 2, 5, 4], [10, 1, 10, 1, 10], [1, 1, 1, 1, 1]])
+    def test_chain_plus_sums(self, a: int, b: int, c: int, d: int, e: int):
+        '''
+        Compares `A @ B @ C @ D + E + F` with `numpy`, which we assume as correct.
+        '''
+        A, B, C, D = small(a, b), small(b, c), small(c, d), small(d, e)
+        E, F = small(a, e), small(a, e)
+        expression = A @ B @ C @ D + E + F
+        self.assertIsInstance(expression, MatrixSum)
+        self.assertEqual(len(expression.terms), 3)
+        self.assertEqual(len(expression.terms[0].factors), 4)
+        numpy.testing.assert_array_equal(
+            expression.evaluate()._matrix,
+            A._matrix @ B._matrix @ C._matrix @ D._matrix + E._matrix + F._matrix
+        )
+
+    def test_nested(self):
+        '''
+        Sums inside products are evaluated before the chain.
+        '''
+        A, B, C, D = small(4, 6), small(6, 3), small(6, 3), small(3, 5)
+        numpy.testing.assert_array_equal(
+            (A @ (B + C) @ D + A @ B @ D).evaluate()._matrix,
+            A._matrix @ (B._matrix + C._matrix) @ D._matrix + A._matrix @ B._matrix @ D._matrix
+        )
+
+    def test_chain_order(self):
+        '''
+        The classic textbook chain, and the cost of a lopsided product.
+        '''
+        cost, split = chain_order([30, 35, 15, 5, 10, 20, 25])
+        self.assertEqual(cost, 15125)
+        self.assertEqual(split[0][5], 2)
+        A, B, C = Matrix(10, 100), Matrix(100, 5), Matrix(5, 50)
+        product = A @ B @ C
+        self.assertIsInstance(product, MatrixProduct)
+        self.assertEqual(product.cost(), 10 * 100 * 5 + 10 * 5 * 50)
+
+    def test_errors(self):
+        '''
+        Wrong sizes are rejected when building the expression.
+        '''
+        with self.assertRaises(ValueError):
+            Matrix(2, 3) @ Matrix(2, 3)
+        with self.assertRaises(ValueError):
+            Matrix(2, 3) + Matrix(3, 2)
+        with self.assertRaises(TypeError):
+            Matrix(2, 3) + 1
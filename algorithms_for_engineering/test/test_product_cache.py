@@ -0,0 +1,103 @@
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import functools
+import unittest
+import numpy.testing
+
+from parameterized import parameterized
+from algorithms_for_engineering.matrix import Matrix, matrix_product_naive
+from algorithms_for_engineering.product_cache import ProductCache, digest
+
+
+class TestProductCache(unittest.TestCase):
+
+    @parameterized.expand([[Matrix(6, 6, 'random'), Matrix(6, 6, 'random')] for _ in range(3)])
+    def test_hits(self, A: Matrix, B: Matrix):
+        '''
+        The same content gives a hit, even in another Matrix, and the result is correct.
+        '''
+        cache = ProductCache()
+        product = cache.cached(matrix_product_naive)
+        first = product(A, B)
+        copy = Matrix(6, 6)
+        copy[:, :] = B._matrix.astype(object)
+        B_again = Matrix._wrap(B._matrix.copy())
+        second = product(A, B_again)
+        numpy.testing.assert_array_equal(second._matrix, A._matrix @ B._matrix)
+        numpy.testing.assert_array_equal(first._matrix, second._matrix)
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+        # Same values with another type are a different product.
+        product(A, copy)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_read_only(self):
+        '''
+        Cached results cannot be changed.
+        '''
+        cache = ProductCache()
+        C = cache.product(matrix_product_naive, Matrix(2, 2, 'random'), Matrix(2, 2, 'random'))
+        with self.assertRaises(ValueError):
+            C[0, 0] = 1
+        with self.assertRaises(ValueError):
+            C[0][0] = 1
+
+    def test_invalidation(self):
+        '''
+        Changes are seen however they are made, `invalidate` only frees the old results.
+        '''
+        cache = ProductCache()
+        A, B = Matrix(3, 3, 'random'), Matrix(3, 3, 'random')
+        cache.product(matrix_product_naive, A, B)
+        old = digest(A)
+        A[0, 0] = A[0, 0] + 1
+        self.assertNotEqual(digest(A), old)
+        numpy.testing.assert_array_equal(
+            cache.product(matrix_product_naive, A, B)._matrix, A._matrix @ B._matrix
+        )
+        self.assertEqual(cache.stats()['misses'], 2)
+
+        # Through a view, after the digest was computed.
+        A[0][1] += 1
+        numpy.testing.assert_array_equal(
+            cache.product(matrix_product_naive, A, B)._matrix, A._matrix @ B._matrix
+        )
+        self.assertEqual(cache.stats()['misses'], 3)
+        cache.invalidate(A)
+        self.assertEqual(cache.stats()['entries'], 2)
+
+    def test_functions(self):
+        '''
+        Functions with the same name are different products, partials can be cached too.
+        '''
+        cache = ProductCache()
+        A, B = Matrix(2, 2, 'random'), Matrix(2, 2, 'random')
+        functions = [lambda X, Y, k=k: Matrix._wrap(X._matrix @ Y._matrix * k) for k in (1, 2)]
+        results = [cache.product(function, A, B) for function in functions]
+        numpy.testing.assert_array_equal(results[1]._matrix, 2 * results[0]._matrix)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+        product = cache.cached(functools.partial(matrix_product_naive))
+        numpy.testing.assert_array_equal(product(A, B)._matrix, A._matrix @ B._matrix)
+        self.assertEqual(cache.cached(matrix_product_naive).__name__, 'matrix_product_naive')
+
+    def test_eviction(self):
+        '''
+        Least recently used results are evicted over the size limit.
+        '''
+        operands = [Matrix(4, 4, 'random') for _ in range(3)]
+        # Room for two results.
+        probe = ProductCache()
+        probe.product(matrix_product_naive, operands[0], operands[0])
+        cache = ProductCache(max_bytes=2 * probe.stats()['bytes'])
+        cache.product(matrix_product_naive, operands[0], operands[0])
+        cache.product(matrix_product_naive, operands[1], operands[1])
+        cache.product(matrix_product_naive, operands[0], operands[0])
+        cache.product(matrix_product_naive, operands[2], operands[2])
+        stats = cache.stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertLessEqual(stats['bytes'], cache.max_bytes)
+        cache.product(matrix_product_naive, operands[0], operands[0])
+        self.assertEqual(cache.stats()['hits'], 2)
+        cache.product(matrix_product_naive, operands[1], operands[1])
+        self.assertEqual(cache.stats()['misses'], 4)
@@ -0,0 +1,7 @@
+'''
+Benchmarks for the algorithms in the other packages, with size sweeps and JSON results.
+
+Run them with `python -m benchmarks run --output results.json`, and compare two result files with
+`python -m benchmarks compare old.json new.json`, which reports the benchmarks that got slower than a
+threshold.
+'''
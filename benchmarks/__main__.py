@@ -0,0 +1,62 @@
+'''
+Command line interface for the benchmarks.
+'''
+
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import argparse
+import sys
+
+from .suite import BENCHMARKS, run_benchmarks, save_results, load_results, compare_results
+
+
+def main(arguments=None) -> int:
+    '''
+    Parameters:
+        arguments : List[str]
+            The command line arguments, `sys.argv[1:]` if not given.
+
+    Returns:
+        int : The exit code, 1 if the comparison found regressions.
+    '''
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run the benchmarks.')
+    run.add_argument('-b', '--benchmark', action='append', choices=[b.name for b in BENCHMARKS],
+                     help='Benchmark to run, can be repeated. All of them by default.')
+    run.add_argument('-s', '--sizes', type=int, nargs='+',
+                     help="Sizes to use instead of the benchmarks' default ones.")
+    run.add_argument('-w', '--warmup', type=int, default=1, help='Untimed runs for each size.')
+    run.add_argument('-r', '--repeat', type=int, default=5, help='Timed runs for each size.')
+    run.add_argument('-o', '--output', help='JSON file for the results.')
+
+    compare = commands.add_parser('compare', help='Find regressions between two result files.')
+    compare.add_argument('old', help='Reference results.')
+    compare.add_argument('new', help='Results to check.')
+    compare.add_argument('-t', '--threshold', type=float, default=0.1,
+                         help='Relative slowdown above which a benchmark is a regression.')
+
+    args = parser.parse_args(arguments)
+
+    if args.command == 'run':
+        selected = [b for b in BENCHMARKS if not args.benchmark or b.name in args.benchmark]
+        results = run_benchmarks(selected, args.sizes, args.warmup, args.repeat)
+        for name, sizes in results['benchmarks'].items():
+            for size, timing in sizes.items():
+                print(f"{name:<24} {size:>10} {timing['min'] * 1000:>12.3f} ms")
+        if args.output:
+            save_results(results, args.output)
+        return 0
+
+    regressions = compare_results(load_results(args.old), load_results(args.new), args.threshold)
+    for r in regressions:
+        print(f"{r['name']:<24} {r['size']:>10} {r['old'] * 1000:>12.3f} ms -> "
+              f"{r['new'] * 1000:>12.3f} ms ({r['ratio']:.2f}x)")
+    if not regressions:
+        print("No regressions.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,391 @@
+'''
+Opt-in counting of the elementary operations (comparisons, swaps, node allocations, element reads
+and writes) done by the algorithm classes, with optional timing.
+
+Nothing in the algorithm classes is changed: `instrument` replaces their methods with counting
+wrappers, either on a single instance (by switching it to an instrumented subclass) or globally on
+the class itself, and `uninstrument` puts the originals back. When not instrumented there is no
+overhead at all.
+
+Comparisons are counted by wrapping the priorities (or values) given to the instrumented objects in
+a key that counts every comparison it takes part in. Keys pushed into a queue stay wrapped while
+the queue is instrumented, and are unwrapped by `uninstrument`: for a class, in every queue pushed to
+while it was instrumented.
+
+```python
+counter = OperationCounter()
+queue = instrument(HeapMaxPQ(), counter)
+for priority in priorities:
+    queue.push(priority, priority)
+counter.summary()['calls']['HeapMaxPQ.push']['max']['comparisons']
+```
+'''
+
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import time
+import weakref
+
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Union
+
+from algorithms_for_engineering.matrix import Matrix
+from byte_by_byte.binary_search_tree import BinarySearchTree
+from byte_by_byte.monotone_priority_queue import MonotoneMinPQ
+from byte_by_byte.priority_queue import PriorityQueue
+
+
+class Call():
+
+    '''
+    Operations counted during a call (or any span), and its duration if timing is enabled.
+    '''
+
+    def __init__(self, name: str):
+        '''
+        Parameters:
+            name : str
+                Name of the call, e.g. `HeapMaxPQ.push`.
+        '''
+        self.name = name
+        self.counts = Counter()
+        self.duration: float = None
+
+
+class OperationCounter():
+
+    '''
+    Collects the counts of the instrumented objects, in total and for each call.
+    '''
+
+    def __init__(self, timing: bool = False):
+        '''
+        Parameters:
+            timing : bool
+                Whether to measure the duration of each call.
+        '''
+        self.timing = timing
+        self.totals = Counter()
+        self.calls: List[Call] = list()
+        self._open: List[Call] = list()
+
+    def add(self, operation: str, amount: int = 1):
+        '''
+        Count an operation, in the totals and in every open span.
+
+        Parameters:
+            operation : str
+                Name of the operation, e.g. `comparisons`.
+
+            amount : int
+                How many operations to count.
+        '''
+        self.totals[operation] += amount
+        for call in self._open:
+            call.counts[operation] += amount
+
+    @contextmanager
+    def span(self, name: str):
+        '''
+        Context manager recording the operations done inside it as a call. Spans can be nested, the
+        operations are counted in all of them.
+
+        Parameters:
+            name : str
+                Name of the call.
+        '''
+        call = Call(name)
+        self._open.append(call)
+        start = time.perf_counter() if self.timing else None
+        try:
+            yield call
+        finally:
+            if self.timing:
+                call.duration = time.perf_counter() - start
+            self._open.remove(call)
+            self.calls.append(call)
+
+    def reset(self):
+        '''
+        Forget all the counts and calls.
+        '''
+        self.totals.clear()
+        self.calls.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        '''
+        Returns:
+            Dict[str, Any] : The totals, and for each call name the number of calls and the total,
+            mean and maximum count of each operation (and duration, if timing is enabled).
+        '''
+        grouped: Dict[str, List[Call]] = dict()
+        for call in self.calls:
+            grouped.setdefault(call.name, list()).append(call)
+
+        calls = dict()
+        for name, group in grouped.items():
+            total = sum((call.counts for call in group), Counter())
+            calls[name] = {
+                'calls': len(group),
+                'total': dict(total),
+                'mean': {op: count / len(group) for op, count in total.items()},
+                'max': {op: max(call.counts[op] for call in group) for op in total}
+            }
+            if self.timing:
+                calls[name]['time'] = sum(call.duration for call in group)
+        return {'totals': dict(self.totals), 'calls': calls}
+
+
+class _CountedKey():
+
+    '''
+    Wrapper for a priority or value, counting the comparisons it takes part in.
+    '''
+
+    __slots__ = ('key', 'counter')
+
+    def __init__(self, key: Any, counter: OperationCounter):
+        self.key = key
+        self.counter = counter
+
+    def __lt__(self, other):
+        self.counter.add('comparisons')
+        return self.key < _unwrap(other)
+
+    def __le__(self, other):
+        self.counter.add('comparisons')
+        return self.key <= _unwrap(other)
+
+    def __gt__(self, other):
+        self.counter.add('comparisons')
+        return self.key > _unwrap(other)
+
+    def __ge__(self, other):
+        self.counter.add('comparisons')
+        return self.key >= _unwrap(other)
+
+    def __eq__(self, other):
+        self.counter.add('comparisons')
+        return self.key == _unwrap(other)
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return f"_CountedKey({self.key!r})"
+
+
+def _unwrap(value: Any) -> Any:
+    return value.key if isinstance(value, _CountedKey) else value
+
+
+def _queue_methods(cls: type) -> Dict[str, Callable]:
+    '''
+    Counting wrappers for a PriorityQueue class: calls to push, pop and peek, comparisons between
+    priorities and swaps.
+    '''
+    push, pop, peek = cls.push, cls.pop, cls.peek
+    name = cls.__name__
+
+    def instrumented_push(self, priority, item):
+        counter = self._operation_counter
+        with counter.span(f'{name}.push'):
+            push(self, _CountedKey(_unwrap(priority), counter), item)
+        # With class instrumentation, remember the queue to unwrap its keys in `uninstrument`.
+        queues = getattr(self, '_instrumented_queues', None)
+        if queues is not None:
+            queues.add(self)
+
+    def instrumented_pop(self):
+        with self._operation_counter.span(f'{name}.pop'):
+            return pop(self)
+
+    def instrumented_peek(self):
+        with self._operation_counter.span(f'{name}.peek'):
+            return peek(self)
+
+    methods = {'push': instrumented_push, 'pop': instrumented_pop, 'peek': instrumented_peek}
+    swap = getattr(cls, '_swap', None)
+    if swap is not None:
+        def instrumented_swap(self, i, j):
+            self._operation_counter.add('swaps')
+            swap(self, i, j)
+        methods['_swap'] = instrumented_swap
+    return methods
+
+
+def _tree_methods(cls: type) -> Dict[str, Callable]:
+    '''
+    Counting wrappers for a BinarySearchTree class: calls to add and remove, comparisons between
+    values and node allocations.
+    '''
+    add, remove, new_node = cls.add, cls.remove, cls._new_node
+    name = cls.__name__
+
+    def instrumented_add(self, value):
+        counter = self._operation_counter
+        with counter.span(f'{name}.add'):
+            add(self, _CountedKey(value, counter))
+
+    def instrumented_new_node(self, value):
+        self._operation_counter.add('allocations')
+        return new_node(self, _unwrap(value))
+
+    def instrumented_remove(self, value):
+        counter = self._operation_counter
+        with counter.span(f'{name}.remove'):
+            return remove(self, _CountedKey(value, counter))
+
+    return {'add': instrumented_add, 'remove': instrumented_remove, '_new_node': instrumented_new_node}
+
+
+def _matrix_methods(cls: type) -> Dict[str, Callable]:
+    '''
+    Counting wrappers for a Matrix class: element (or slice) reads and writes.
+    '''
+    getitem, setitem = cls.__getitem__, cls.__setitem__
+
+    def instrumented_getitem(self, index):
+        self._operation_counter.add('reads')
+        return getitem(self, index)
+
+    def instrumented_setitem(self, index, value):
+        self._operation_counter.add('writes')
+        setitem(self, index, value)
+
+    return {'__getitem__': instrumented_getitem, '__setitem__': instrumented_setitem}
+
+
+def _methods(cls: type) -> Dict[str, Callable]:
+    '''
+    Raises:
+        TypeError : if the class cannot be instrumented.
+    '''
+    if issubclass(cls, MonotoneMinPQ):
+        # Their priorities must be plain integers, which cannot be wrapped to count comparisons.
+        raise TypeError(f"Cannot instrument {cls.__name__}, monotone queues need plain integers.")
+    if issubclass(cls, PriorityQueue):
+        return _queue_methods(cls)
+    if issubclass(cls, BinarySearchTree):
+        return _tree_methods(cls)
+    if issubclass(cls, Matrix):
+        return _matrix_methods(cls)
+    raise TypeError(f"Cannot instrument {cls.__name__}.")
+
+
+_subclasses: Dict[type, type] = dict()
+'''Instrumented subclass of each class, used for instances.'''
+
+
+def instrument(target: Union[Any, type], counter: OperationCounter = None) -> Any:
+    '''
+    Start counting the operations of a PriorityQueue (except the monotone ones), BinarySearchTree or
+    Matrix instance, or of all the instances of one of those classes if a class is given.
+
+    Parameters:
+        target : Union[Any, type]
+            The instance or class to instrument.
+
+        counter : OperationCounter
+            Where the operations are counted, a new one if not given.
+
+    Returns:
+        The target, for convenience.
+
+    Raises:
+        TypeError : if the target cannot be instrumented.
+        ValueError : if the target is already instrumented.
+    '''
+    counter = counter if counter is not None else OperationCounter()
+    if isinstance(target, type):
+        if '_operation_counter' in vars(target):
+            raise ValueError(f"{target.__name__} is already instrumented.")
+        methods = _methods(target)
+        target._instrumentation_originals = {name: vars(target).get(name) for name in methods}
+        for name, method in methods.items():
+            setattr(target, name, method)
+        if issubclass(target, PriorityQueue):
+            target._instrumented_queues = weakref.WeakSet()
+        target._operation_counter = counter
+        return target
+
+    if getattr(target, '_operation_counter', None) is not None:
+        raise ValueError("Object is already instrumented.")
+    cls = type(target)
+    if cls not in _subclasses:
+        subclass = type(cls.__name__, (cls,), _methods(cls))
+        subclass._instrumented_base = cls
+        _subclasses[cls] = subclass
+    target.__class__ = _subclasses[cls]
+    target._operation_counter = counter
+    return target
+
+
+def uninstrument(target: Union[Any, type]) -> OperationCounter:
+    '''
+    Stop counting the operations of an instance or class given to `instrument`.
+
+    Parameters:
+        target : Union[Any, type]
+            The instance or class to restore.
+
+    Returns:
+        OperationCounter : The counter that was used.
+
+    Raises:
+        ValueError : if the target is not instrumented.
+    '''
+    if '_operation_counter' not in vars(target):
+        raise ValueError("Target is not instrumented.")
+    counter = vars(target)['_operation_counter']
+
+    if isinstance(target, type):
+        for name, original in target._instrumentation_originals.items():
+            if original is None:
+                delattr(target, name)
+            else:
+                setattr(target, name, original)
+        del target._instrumentation_originals
+        del target._operation_counter
+        if '_instrumented_queues' in vars(target):
+            for queue in target._instrumented_queues:
+                _unwrap_keys(queue)
+            del target._instrumented_queues
+        return counter
+
+    del target._operation_counter
+    if getattr(type(target), '_instrumented_base', None) is not None:
+        target.__class__ = type(target)._instrumented_base
+    if isinstance(target, PriorityQueue):
+        _unwrap_keys(target)
+    return counter
+
+
+def _unwrap_keys(queue: PriorityQueue):
+    '''
+    Replace the wrapped priorities in a queue with the original ones.
+    '''
+    queue._array[:] = [(_unwrap(priority), item) for priority, item in queue._array]
+
+
+@contextmanager
+def instrumented(target: Union[Any, type], counter: OperationCounter = None):
+    '''
+    Context manager instrumenting the target only inside it.
+
+    Parameters:
+        target : Union[Any, type]
+            The instance or class to instrument.
+
+        counter : OperationCounter
+            Where the operations are counted, a new one if not given.
+
+    Returns:
+        OperationCounter : The counter, as value of the `with` statement.
+    '''
+    instrument(target, counter)
+    try:
+        yield vars(target)['_operation_counter']
+    finally:
+        uninstrument(target)
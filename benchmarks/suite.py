@@ -0,0 +1,306 @@
+'''
+The benchmarks: each one builds its input for a given size and times a single call, repeated a few
+times after some warm-up runs. Results are stored as JSON, so that two runs can be compared.
+'''
+
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import json
+import platform
+import statistics
+import time
+import numpy
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Union
+
+from algorithms_for_engineering.matrix import Matrix, matrix_sum, matrix_product_naive
+from byte_by_byte.array_median import median, median_batch, median_merge
+from byte_by_byte.binary_search_tree import BinarySearchTree, TreeNode
+from byte_by_byte.monotone_priority_queue import BucketMinPQ, RadixHeapMinPQ
+from byte_by_byte.priority_queue import ArrayMaxPQ, HeapMaxPQ
+
+
+class Benchmark():
+
+    '''
+    A function timed over a sweep of input sizes.
+    '''
+
+    def __init__(self, name: str, setup: Callable[[int], Callable[[], Any]], sizes: Sequence[int]):
+        '''
+        Parameters:
+            name : str
+                Unique name of the benchmark.
+
+            setup : Callable[[int], Callable[[], Any]]
+                Builds the input for a size, and returns the function to time. Called before every
+                run, so the timed function can modify its input.
+
+            sizes : Sequence[int]
+                The default input sizes.
+        '''
+        self.name = name
+        self.setup = setup
+        self.sizes = sizes
+
+    def run(self, size: int, warmup: int = 1, repeat: int = 5) -> Dict[str, float]:
+        '''
+        Time the benchmark for a size.
+
+        Parameters:
+            size : int
+                The input size.
+
+            warmup : int
+                Number of untimed runs.
+
+            repeat : int
+                Number of timed runs.
+
+        Returns:
+            Dict[str, float] : Minimum, mean and median time in seconds, and number of runs.
+
+        Raises:
+            ValueError : if repeat is not positive.
+        '''
+        if repeat < 1:
+            raise ValueError("Repeat must be positive.")
+
+        for _ in range(warmup):
+            self.setup(size)()
+        times = list()
+        for _ in range(repeat):
+            function = self.setup(size)
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+        return {
+            'min': min(times),
+            'mean': statistics.mean(times),
+            'median': statistics.median(times),
+            'repeat': repeat
+        }
+
+
+def _matrix_sum(size: int) -> Callable[[], Any]:
+    A, B = Matrix(size, size, 'random'), Matrix(size, size, 'random')
+    return lambda: matrix_sum(A, B)
+
+
+def _matrix_product_naive(size: int) -> Callable[[], Any]:
+    A, B = Matrix(size, size, 'random'), Matrix(size, size, 'random')
+    return lambda: matrix_product_naive(A, B)
+
+
+def _queue(queue_class: type) -> Callable[[int], Callable[[], Any]]:
+    def setup(size: int) -> Callable[[], Any]:
+        priorities = numpy.random.rand(size).tolist()
+
+        def push_pop():
+            queue = queue_class()
+            for priority in priorities:
+                queue.push(priority, priority)
+            while queue:
+                queue.pop()
+        return push_pop
+    return setup
+
+
+def _tree_add(size: int) -> Callable[[], Any]:
+    values = numpy.random.rand(size).tolist()
+
+    def add():
+        tree = BinarySearchTree(TreeNode(0.5))
+        for value in values:
+            tree.add(value)
+    return add
+
+
+def _median(function: Callable) -> Callable[[int], Callable[[], Any]]:
+    def setup(size: int) -> Callable[[], Any]:
+        first = sorted(numpy.random.rand(size).tolist())
+        second = sorted(numpy.random.rand(size + 1).tolist())
+        return lambda: function(first, second)
+    return setup
+
+
+def _median_batch(batched: bool) -> Callable[[int], Callable[[], Any]]:
+    def setup(size: int) -> Callable[[], Any]:
+        # Many pairs of short arrays, either all at once or one `median` call per pair.
+        first = numpy.sort(numpy.random.rand(size, 64), axis=1)
+        second = numpy.sort(numpy.random.rand(size, 65), axis=1)
+        if batched:
+            return lambda: median_batch(first, second)
+        return lambda: [median(a, b) for a, b in zip(first, second)]
+    return setup
+
+
+def dijkstra(graph: List[List[Any]], source: int, queue_class: type) -> List[int]:
+    '''
+    Shortest path distances with Dijkstra's algorithm, pushing duplicates instead of decreasing keys.
+
+    Parameters:
+        graph : List[List[Any]]
+            Adjacency lists of (neighbour, weight) pairs, weights are non-negative integers.
+
+        source : int
+            The starting node.
+
+        queue_class : type
+            A Min Priority Queue class, or `HeapMaxPQ` which is used with negated priorities.
+
+    Returns:
+        List[int] : The distance of every node from the source, None if unreachable.
+    '''
+    sign = -1 if queue_class is HeapMaxPQ else 1
+    distances = [None] * len(graph)
+    distances[source] = 0
+    queue = queue_class()
+    queue.push(0, source)
+    done = [False] * len(graph)
+    while queue:
+        node = queue.pop()
+        if done[node]:
+            continue
+        done[node] = True
+        for neighbour, weight in graph[node]:
+            distance = distances[node] + weight
+            if distances[neighbour] is None or distance < distances[neighbour]:
+                distances[neighbour] = distance
+                queue.push(sign * distance, neighbour)
+    return distances
+
+
+def _dijkstra(queue_class: type) -> Callable[[int], Callable[[], Any]]:
+    def setup(size: int) -> Callable[[], Any]:
+        # Random graph with 4 edges per node and small integer weights.
+        targets = numpy.random.randint(0, size, (size, 4)).tolist()
+        weights = numpy.random.randint(1, 100, (size, 4)).tolist()
+        graph = [list(zip(t, w)) for t, w in zip(targets, weights)]
+        return lambda: dijkstra(graph, 0, queue_class)
+    return setup
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark('matrix_sum', _matrix_sum, [16, 32, 64]),
+    Benchmark('matrix_product_naive', _matrix_product_naive, [8, 16, 32]),
+    Benchmark('ArrayMaxPQ', _queue(ArrayMaxPQ), [100, 1000]),
+    Benchmark('HeapMaxPQ', _queue(HeapMaxPQ), [1000, 10000]),
+    Benchmark('BinarySearchTree.add', _tree_add, [1000, 10000]),
+    Benchmark('median', _median(median), [1000, 100000, 1000000]),
+    Benchmark('median_merge', _median(median_merge), [1000, 100000]),
+    Benchmark('median_batch', _median_batch(True), [1000, 100000]),
+    Benchmark('median_batch.loop', _median_batch(False), [1000, 100000]),
+    Benchmark('dijkstra.HeapMaxPQ', _dijkstra(HeapMaxPQ), [1000, 10000]),
+    Benchmark('dijkstra.BucketMinPQ', _dijkstra(BucketMinPQ), [1000, 10000]),
+    Benchmark('dijkstra.RadixHeapMinPQ', _dijkstra(RadixHeapMinPQ), [1000, 10000]),
+]
+'''All the available benchmarks.'''
+
+
+def run_benchmarks(
+    benchmarks: Iterable[Benchmark] = BENCHMARKS,
+    sizes: Sequence[int] = None,
+    warmup: int = 1,
+    repeat: int = 5
+) -> Dict[str, Any]:
+    '''
+    Run some benchmarks over their sizes.
+
+    Parameters:
+        benchmarks : Iterable[Benchmark]
+            The benchmarks to run.
+
+        sizes : Sequence[int]
+            Sizes to use instead of each benchmark's default ones.
+
+        warmup : int
+            Number of untimed runs for each size.
+
+        repeat : int
+            Number of timed runs for each size.
+
+    Returns:
+        Dict[str, Any] : The results, with some info on the machine and each benchmark's timings for
+        each size.
+    '''
+    results = dict()
+    for benchmark in benchmarks:
+        results[benchmark.name] = {
+            str(size): benchmark.run(size, warmup, repeat) for size in (sizes or benchmark.sizes)
+        }
+    return {
+        'machine': {
+            'python': platform.python_version(),
+            'numpy': numpy.__version__,
+            'platform': platform.platform()
+        },
+        'benchmarks': results
+    }
+
+
+def save_results(results: Dict[str, Any], path: Union[Path, str]):
+    '''
+    Parameters:
+        results : Dict[str, Any]
+            Results from `run_benchmarks`.
+
+        path : Union[Path, str]
+            The output JSON file.
+    '''
+    with Path(path).open('w+') as output:
+        json.dump(results, output, indent=4)
+
+
+def load_results(path: Union[Path, str]) -> Dict[str, Any]:
+    '''
+    Parameters:
+        path : Union[Path, str]
+            A JSON file written by `save_results`.
+
+    Returns:
+        Dict[str, Any] : The results.
+    '''
+    with Path(path).open() as source:
+        return json.load(source)
+
+
+def compare_results(
+    old: Dict[str, Any],
+    new: Dict[str, Any],
+    threshold: float = 0.1
+) -> List[Dict[str, Any]]:
+    '''
+    Find the regressions between two runs, comparing the minimum time of the benchmarks and sizes
+    found in both.
+
+    Parameters:
+        old : Dict[str, Any]
+            Results of the reference run.
+
+        new : Dict[str, Any]
+            Results of the run to check.
+
+        threshold : float
+            Relative slowdown above which a benchmark is a regression, 0.1 means 10% slower.
+
+    Returns:
+        List[Dict[str, Any]] : Name, size, old and new time and their ratio for each regression.
+    '''
+    regressions = list()
+    for name, sizes in new['benchmarks'].items():
+        for size, timing in sizes.items():
+            reference = old['benchmarks'].get(name, dict()).get(size)
+            if reference is None:
+                continue
+            ratio = timing['min'] / reference['min'] if reference['min'] else float('inf')
+            if ratio > 1 + threshold:
+                regressions.append({
+                    'name': name,
+                    'size': int(size),
+                    'old': reference['min'],
+                    'new': timing['min'],
+                    'ratio': ratio
+                })
+    return regressions
@@ -0,0 +1,129 @@
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import math
+import unittest
+
+from numpy.random import rand
+from parameterized import parameterized
+
+from algorithms_for_engineering.matrix import Matrix, matrix_product_naive
+from byte_by_byte.binary_search_tree import BinarySearchTree, TreeNode
+from byte_by_byte.monotone_priority_queue import BucketMinPQ, RadixHeapMinPQ
+from byte_by_byte.priority_queue import ArrayMaxPQ, HeapMaxPQ
+from benchmarks.instrumentation import OperationCounter, instrument, uninstrument, instrumented
+from benchmarks.instrumentation import _CountedKey
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    @parameterized.expand([[10], [100], [1000]])
+    def test_heap_is_logarithmic(self, size: int):
+        '''
+        Every push and pop of HeapMaxPQ does a logarithmic number of comparisons and swaps, and the
+        queue still works.
+        '''
+        priorities = list(rand(size))
+        queue = instrument(HeapMaxPQ(), OperationCounter(timing=True))
+        for priority in priorities:
+            queue.push(priority, priority)
+        result = [queue.pop() for _ in range(size)]
+        self.assertListEqual(result, sorted(priorities, reverse=True))
+
+        summary = uninstrument(queue).summary()
+        levels = math.ceil(math.log2(size + 1))
+        self.assertEqual(summary['calls']['HeapMaxPQ.push']['calls'], size)
+        self.assertLessEqual(summary['calls']['HeapMaxPQ.push']['max']['comparisons'], levels)
+        self.assertLessEqual(summary['calls']['HeapMaxPQ.pop']['max']['swaps'], levels)
+        self.assertLessEqual(summary['calls']['HeapMaxPQ.pop']['max']['comparisons'], 2 * levels)
+        self.assertGreater(summary['calls']['HeapMaxPQ.pop']['time'], 0)
+        self.assertEqual(
+            summary['totals']['swaps'],
+            sum(c['total'].get('swaps', 0) for c in summary['calls'].values())
+        )
+
+    def test_instance_and_class(self):
+        '''
+        Instrumenting an instance does not affect others, instrumenting a class affects all of
+        them, and both can be undone.
+        '''
+        counter = OperationCounter()
+        queue, other = ArrayMaxPQ(), ArrayMaxPQ()
+        with instrumented(queue, counter):
+            for priority in (3, 1, 2):
+                queue.push(priority, priority)
+                other.push(priority, priority)
+        self.assertEqual(counter.totals['swaps'], 2)
+        self.assertEqual(type(queue), ArrayMaxPQ)
+        self.assertEqual(queue._array, other._array)
+
+        push = ArrayMaxPQ.push
+        with instrumented(ArrayMaxPQ) as counter:
+            other.push(0, 0)
+        other.push(4, 4)
+        self.assertEqual(counter.summary()['calls']['ArrayMaxPQ.push']['calls'], 1)
+        self.assertIs(ArrayMaxPQ.push, push)
+        self.assertNotIn('_operation_counter', vars(ArrayMaxPQ))
+
+        with self.assertRaises(ValueError):
+            uninstrument(queue)
+        with self.assertRaises(TypeError):
+            instrument(object())
+        for monotone in (BucketMinPQ, RadixHeapMinPQ):
+            with self.assertRaises(TypeError):
+                instrument(monotone())
+            with self.assertRaises(TypeError):
+                instrument(monotone)
+            self.assertNotIn('_operation_counter', vars(monotone))
+
+    def test_class_keys_unwrapped(self):
+        '''
+        Uninstrumenting a class unwraps the keys of every queue pushed to meanwhile.
+        '''
+        queues = [HeapMaxPQ(), HeapMaxPQ()]
+        with instrumented(HeapMaxPQ) as counter:
+            for priority in (3, 1, 2):
+                for queue in queues:
+                    queue.push(priority, priority)
+        self.assertGreater(counter.totals['comparisons'], 0)
+        self.assertNotIn('_instrumented_queues', vars(HeapMaxPQ))
+        for queue in queues:
+            self.assertFalse(any(isinstance(p, _CountedKey) for p, _ in queue._array))
+            queue.push(4, 4)
+            self.assertListEqual([queue.pop() for _ in range(4)], [4, 3, 2, 1])
+
+    def test_tree(self):
+        '''
+        Each add allocates exactly one node, and node values are not wrapped.
+        '''
+        tree = instrument(BinarySearchTree(TreeNode(0.5)))
+        for value in rand(100):
+            tree.add(value)
+        counter = uninstrument(tree)
+        self.assertEqual(counter.totals['allocations'], 100)
+        # Other trees are not counted, even while one is instrumented.
+        other = BinarySearchTree(TreeNode(0.5))
+        with instrumented(BinarySearchTree(TreeNode(0.5))) as other_counter:
+            other.add(0.25)
+        self.assertEqual(other_counter.totals['allocations'], 0)
+        self.assertGreaterEqual(counter.totals['comparisons'], 100)
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            self.assertIs(type(node), TreeNode)
+            self.assertNotIsInstance(node.value, _CountedKey)
+            stack.extend(child for child in (node.left, node.right) if child is not None)
+
+    @parameterized.expand([[2, 3, 4], [5, 5, 5]])
+    def test_matrix_reads(self, n: int, m: int, p: int):
+        '''
+        The naive product reads two elements of the operands per multiplication.
+        '''
+        A, B = Matrix(n, m, 'random'), Matrix(m, p, 'random')
+        counter = OperationCounter()
+        instrument(A, counter)
+        instrument(B, counter)
+        with counter.span('matrix_product_naive'):
+            matrix_product_naive(A, B)
+        self.assertEqual(counter.totals['reads'], 2 * n * m * p)
+        self.assertEqual(counter.summary()['calls']['matrix_product_naive']['total']['reads'],
+                         2 * n * m * p)
@@ -0,0 +1,53 @@
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import tempfile
+import unittest
+
+from pathlib import Path
+from parameterized import parameterized
+
+from benchmarks.suite import BENCHMARKS, Benchmark, run_benchmarks, save_results, load_results
+from benchmarks.suite import compare_results, dijkstra
+from byte_by_byte.monotone_priority_queue import BucketMinPQ, RadixHeapMinPQ
+from byte_by_byte.priority_queue import HeapMaxPQ
+
+
+class TestSuite(unittest.TestCase):
+
+    @parameterized.expand([[benchmark] for benchmark in BENCHMARKS])
+    def test_benchmark(self, benchmark: Benchmark):
+        '''
+        Every benchmark runs on a small size.
+        '''
+        timing = benchmark.run(4, warmup=0, repeat=2)
+        self.assertEqual(timing['repeat'], 2)
+        self.assertGreaterEqual(timing['mean'], timing['min'])
+
+    def test_save_and_compare(self):
+        '''
+        Results survive a JSON round trip, and only slowdowns above the threshold are reported.
+        '''
+        results = run_benchmarks(BENCHMARKS[:2], sizes=[2, 4], warmup=0, repeat=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, 'results.json')
+            save_results(results, path)
+            loaded = load_results(path)
+        self.assertEqual(loaded, results)
+
+        slower = {'benchmarks': {
+            name: {size: dict(timing, min=timing['min'] * 1.5) for size, timing in sizes.items()}
+            for name, sizes in loaded['benchmarks'].items()
+        }}
+        self.assertEqual(compare_results(loaded, loaded), [])
+        self.assertEqual(compare_results(loaded, slower, threshold=0.6), [])
+        regressions = compare_results(loaded, slower, threshold=0.2)
+        self.assertEqual(len(regressions), 4)
+        self.assertEqual({r['size'] for r in regressions}, {2, 4})
+
+    def test_dijkstra(self):
+        '''
+        All the queues find the same distances.
+        '''
+        graph = [[(1, 4), (2, 1)], [(3, 1)], [(1, 2), (3, 5)], [], [(0, 1)]]
+        for queue_class in (HeapMaxPQ, BucketMinPQ, RadixHeapMinPQ):
+            self.assertListEqual(dijkstra(graph, 0, queue_class), [0, 3, 1, 4, None])
@@ -3,19 +3,324 @@
 
 **Explanation**: Given an array of length `n`, its median is the `n/2` smallest element in the array
 if `n` is odd, and the average of the `n/2` and `(n-1)/2` elements if `n` is even.
-The two arrays are merged into one while keeping the ordering and then the median is computed on the
-resulting array.
+
+The simplest solution merges the two arrays into one while keeping the ordering, and then computes
+the median on the resulting array. This takes `O(n+m)` time and memory.
+
+There is no need to actually merge the arrays though. Taking the `c` smallest elements of the union
+means taking the first `i` elements of the first array and the first `c-i` elements of the second.
+The right `i` is the one for which the last taken element of each array is not bigger than the
+first non-taken element of the other one, and it can be found with a binary search. Searching on
+the shorter of the two arrays, the median (or any `k`-th smallest element) is found in
+`O(log(min(n, m)))` time, without allocating anything.
+
+The same idea extends to many sorted arrays (e.g. the shards of a large sorted dataset). Pick a
+pivot among the middle elements of the arrays, count how many elements are smaller than it with a
+binary search on each array, and discard from every array the side that cannot contain the answer.
+Using the weighted median of the middle elements as pivot, each round discards at least a quarter of
+the remaining candidates, so only `O(k log(n))` elements are read per round. Arrays can also be
+sorted binary files, memory-mapped so that only the elements that are actually read get loaded.
+
+When the medians of many small pairs of arrays are needed, the binary searches for all the pairs can
+run at the same time as vectorized NumPy operations, one step of every search per iteration, instead
+of paying the interpreter overhead of a function call per pair.
 '''
 
 __author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
 
-from typing import Sequence
-from numbers import Number
+import numpy
+
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Iterable, List, Sequence, Union
+from numbers import Number, Real
 
 
 def median(first: Sequence[Number], second: Sequence[Number]) -> Number:
     '''
-    Find the median of two sorted arrays.
+    Find the median of two sorted arrays, with a binary search over the partitions of the two
+    arrays. Works with any indexable sequence, NumPy arrays included.
+
+    Parameters:
+        first : Sequence[Number]
+            The first of the two arrays. Must be sorted.
+
+        second : Sequence[Number]
+            The second of the two arrays. Must be sorted.
+
+    Returns:
+        Number : The median of the two arrays.
+
+    Raises:
+        ValueError : if both arrays are empty.
+    '''
+    n = len(first)
+    m = len(second)
+    if not n + m:
+        raise ValueError("Cannot compute the median of two empty arrays.")
+    # Always search on the shorter array.
+    if n > m:
+        first, second, n, m = second, first, m, n
+
+    size = n + m
+    # The left half holds the `size // 2` smallest elements.
+    i = _partition(first, second, size // 2)
+    j = size // 2 - i
+    upper = _right_min(first, second, i, j)
+    # If size is odd return the middle element, otherwise the average of the two middle elements.
+    return upper if size % 2 else _average(upper, _left_max(first, second, i, j))
+
+
+def kth_smallest(first: Sequence[Number], second: Sequence[Number], k: int) -> Number:
+    '''
+    Find the `k`-th smallest element (starting from 0) of the union of two sorted arrays, without
+    merging them.
+
+    Parameters:
+        first : Sequence[Number]
+            The first of the two arrays. Must be sorted.
+
+        second : Sequence[Number]
+            The second of the two arrays. Must be sorted.
+
+        k : int
+            Index of the element in the sorted union of the two arrays.
+
+    Returns:
+        Number : The element that would be at index `k` if the two arrays were merged.
+
+    Raises:
+        IndexError : if `k` is not in `[0, len(first) + len(second))`.
+    '''
+    n = len(first)
+    m = len(second)
+    if not 0 <= k < n + m:
+        raise IndexError(f"k ({k}) out of range for arrays of total size {n + m}.")
+    # Always search on the shorter array.
+    if n > m:
+        first, second, n, m = second, first, m, n
+
+    # The element at index k is the smallest one outside the `k` smallest elements.
+    i = _partition(first, second, k)
+    return _right_min(first, second, i, k - i)
+
+
+def kth_smallest_many(arrays: Iterable[Sequence[Number]], k: int) -> Number:
+    '''
+    Find the `k`-th smallest element (starting from 0) of the union of many sorted arrays, without
+    merging them.
+
+    Parameters:
+        arrays : Iterable[Sequence[Number]]
+            The arrays. Each of them must be sorted, any of them can be empty.
+
+        k : int
+            Index of the element in the sorted union of the arrays.
+
+    Returns:
+        Number : The element that would be at index `k` if the arrays were merged.
+
+    Raises:
+        IndexError : if `k` is not in `[0, total size)`.
+    '''
+    arrays = [a for a in arrays if len(a)]
+    size = sum(len(a) for a in arrays)
+    if not 0 <= k < size:
+        raise IndexError(f"k ({k}) out of range for arrays of total size {size}.")
+
+    # The answer is always in one of the ranges array[lows[i]:highs[i]].
+    lows = [0] * len(arrays)
+    highs = [len(a) for a in arrays]
+    while True:
+        pivot = _weighted_pivot(arrays, lows, highs)
+        # Everything outside the ranges is known to be smaller or bigger than the pivot, so the
+        # counts on the ranges are enough to find the rank of the pivot.
+        smaller = [bisect_left(a, pivot, lo, hi) for a, lo, hi in zip(arrays, lows, highs)]
+        not_bigger = [bisect_right(a, pivot, lo, hi) for a, lo, hi in zip(arrays, lows, highs)]
+        if k < sum(smaller):
+            highs = smaller
+        elif k >= sum(not_bigger):
+            lows = not_bigger
+        else:
+            return pivot
+
+
+def median_many(arrays: Iterable[Sequence[Number]]) -> Number:
+    '''
+    Find the median of the union of many sorted arrays, without merging them.
+
+    Parameters:
+        arrays : Iterable[Sequence[Number]]
+            The arrays. Each of them must be sorted, any of them can be empty.
+
+    Returns:
+        Number : The median of the arrays.
+
+    Raises:
+        ValueError : if all the arrays are empty.
+    '''
+    arrays = list(arrays)
+    size = sum(len(a) for a in arrays)
+    if not size:
+        raise ValueError("Cannot compute the median of empty arrays.")
+
+    upper = kth_smallest_many(arrays, size // 2)
+    return upper if size % 2 else _average(upper, kth_smallest_many(arrays, size // 2 - 1))
+
+
+def quantiles_many(arrays: Iterable[Sequence[Number]], qs: Iterable[Real]) -> List[Number]:
+    '''
+    Find some quantiles of the union of many sorted arrays, without merging them. Values between
+    two elements are linearly interpolated, like `numpy.quantile` does by default.
+
+    Parameters:
+        arrays : Iterable[Sequence[Number]]
+            The arrays. Each of them must be sorted, any of them can be empty.
+
+        qs : Iterable[Real]
+            The quantiles to compute, each in `[0, 1]`.
+
+    Returns:
+        List[Number] : The quantiles, in the same order as `qs`.
+
+    Raises:
+        ValueError : if all the arrays are empty or a quantile is out of range.
+    '''
+    arrays = list(arrays)
+    size = sum(len(a) for a in arrays)
+    if not size:
+        raise ValueError("Cannot compute the quantiles of empty arrays.")
+
+    result = list()
+    for q in qs:
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile {q} not in [0, 1].")
+        position = (size - 1) * q
+        index = int(position)
+        lower = kth_smallest_many(arrays, index)
+        if index == position:
+            result.append(lower)
+        else:
+            upper = kth_smallest_many(arrays, index + 1)
+            # Weighted sum, `upper - lower` could overflow small fixed size types.
+            fraction = position - index
+            result.append(lower * (1 - fraction) + upper * fraction)
+    return result
+
+
+def open_sorted_file(
+    path: Union[Path, str],
+    dtype: Union[numpy.dtype, str] = 'float64'
+) -> numpy.ndarray:
+    '''
+    Open a sorted binary file (e.g. written with `numpy.ndarray.tofile`) as a read-only array,
+    without loading it. Only the elements that are accessed will be read from disk.
+
+    Parameters:
+        path : Union[Path, str]
+            Path of the file, containing raw values of type `dtype` in ascending order.
+
+        dtype : Union[numpy.dtype, str]
+            The type of the values in the file.
+
+    Returns:
+        numpy.ndarray : The memory-mapped content of the file.
+    '''
+    if not Path(path).stat().st_size:
+        # Empty files cannot be memory-mapped.
+        return numpy.empty(0, dtype=dtype)
+    return numpy.memmap(path, dtype=dtype, mode='r')
+
+
+def median_batch(
+    first: numpy.ndarray,
+    second: numpy.ndarray,
+    first_lengths: Sequence[int] = None,
+    second_lengths: Sequence[int] = None
+) -> numpy.ndarray:
+    '''
+    Find the medians of many pairs of sorted arrays at once, running all the binary searches of
+    `median` together as vectorized operations.
+
+    Parameters:
+        first : numpy.ndarray
+            2D array, each row is the first array of a pair, padded to the same length with any
+            value. The first `first_lengths[r]` elements of row `r` must be sorted.
+
+        second : numpy.ndarray
+            2D array, each row is the second array of a pair, padded like `first`.
+
+        first_lengths : Sequence[int]
+            The length of each row of `first`. If not given, rows are not padded.
+
+        second_lengths : Sequence[int]
+            The length of each row of `second`. If not given, rows are not padded.
+
+    Returns:
+        numpy.ndarray : The median of each pair, as floats.
+
+    Raises:
+        ValueError : if the shapes or lengths are not valid, or both arrays of a pair are empty.
+    '''
+    first = numpy.asarray(first)
+    second = numpy.asarray(second)
+    if first.ndim != 2 or second.ndim != 2 or len(first) != len(second):
+        raise ValueError("Arrays must be 2D with the same number of rows.")
+
+    n = _batch_lengths(first, first_lengths)
+    m = _batch_lengths(second, second_lengths)
+    size = n + m
+    if not numpy.all(size):
+        raise ValueError("Cannot compute the median of two empty arrays.")
+    # Empty columns cannot be indexed, they are all padding anyway.
+    if not first.shape[1]:
+        first = numpy.zeros((len(first), 1), dtype=first.dtype)
+    if not second.shape[1]:
+        second = numpy.zeros((len(second), 1), dtype=second.dtype)
+    last_first = first.shape[1] - 1
+    last_second = second.shape[1] - 1
+    # Elements are gathered from the flattened arrays, row `r` starts at `r * columns`.
+    flat_first = first.ravel()
+    flat_second = second.ravel()
+    first_offsets = numpy.arange(len(first)) * first.shape[1]
+    second_offsets = numpy.arange(len(second)) * second.shape[1]
+
+    # Same search as `_partition`, the range of each row is at most min(n, m) long. The bounds are
+    # flat positions in `first`, position `p` in `first` is paired with `pairs - p` in `second`.
+    count = size // 2
+    low = numpy.maximum(0, count - m) + first_offsets
+    high = numpy.minimum(count, n) + first_offsets
+    pairs = second_offsets + count - 1 + first_offsets
+    active = low < high
+    while numpy.any(active):
+        middle = (low + high) // 2
+        # Finished rows may point outside the arrays, `take` clips them and they are ignored.
+        taken = flat_first.take(middle, mode='clip')
+        other = flat_second.take(pairs - middle, mode='clip')
+        smaller = other <= taken
+        numpy.copyto(high, middle, where=active & smaller)
+        numpy.copyto(low, middle + 1, where=active & ~smaller)
+        numpy.less(low, high, out=active)
+
+    low -= first_offsets
+    i = low
+    j = count - i
+    # Same as `_right_min` and `_left_max`.
+    first_right = flat_first.take(first_offsets + numpy.minimum(i, last_first))
+    second_right = flat_second.take(second_offsets + numpy.minimum(j, last_second))
+    upper = numpy.minimum(first_right, second_right)
+    upper = numpy.where(i == n, second_right, numpy.where(j == m, first_right, upper))
+    first_left = flat_first.take(first_offsets + numpy.maximum(i - 1, 0))
+    second_left = flat_second.take(second_offsets + numpy.maximum(j - 1, 0))
+    lower = numpy.maximum(first_left, second_left)
+    lower = numpy.where(i == 0, second_left, numpy.where(j == 0, first_left, lower))
+    return numpy.where(size % 2, upper, _average(upper, lower)).astype(float)
+
+
+def median_merge(first: Sequence[Number], second: Sequence[Number]) -> Number:
+    '''
+    Find the median of two sorted arrays by merging them. Reference implementation, `O(n+m)` time
+    and memory.
 
     Parameters:
         first : Sequence[Number]
@@ -52,4 +357,103 @@ def median(first: Sequence[Number], second: Sequence[Number]) -> Number:
 
     size = n + m
     # If size is odd return the middle element, otherwise the average of the two middle elements.
-    return merged[size // 2] if size % 2 else (merged[size // 2] + merged[(size - 1) // 2]) / 2
+    return merged[size // 2] if size % 2 else _average(merged[size // 2], merged[(size - 1) // 2])
+
+
+def _partition(first: Sequence[Number], second: Sequence[Number], count: int) -> int:
+    '''
+    Find how many of the `count` smallest elements of the union come from `first`.
+
+    Parameters:
+        first : Sequence[Number]
+            The array to search on, should be the shorter one. Must be sorted.
+
+        second : Sequence[Number]
+            The other array. Must be sorted.
+
+        count : int
+            How many elements to take, must be in `[0, len(first) + len(second)]`.
+
+    Returns:
+        int : The number `i` such that `first[:i]` and `second[:count-i]` are the `count` smallest
+        elements.
+    '''
+    low = max(0, count - len(second))
+    high = min(count, len(first))
+    # Smallest i for which second[count - i - 1] <= first[i], i.e. first[i] must not be taken.
+    while low < high:
+        i = (low + high) // 2
+        if second[count - i - 1] <= first[i]:
+            high = i
+        else:
+            low = i + 1
+    return low
+
+
+def _batch_lengths(array: numpy.ndarray, lengths: Sequence[int]) -> numpy.ndarray:
+    '''
+    Returns:
+        numpy.ndarray : The lengths of the rows of a 2D array for `median_batch`, as int array.
+
+    Raises:
+        ValueError : if the lengths do not match the array.
+    '''
+    if lengths is None:
+        return numpy.full(len(array), array.shape[1], dtype=numpy.intp)
+    lengths = numpy.asarray(lengths, dtype=numpy.intp)
+    if lengths.shape != (len(array),) or numpy.any((lengths < 0) | (lengths > array.shape[1])):
+        raise ValueError("Lengths must be one per row and within the row size.")
+    return lengths
+
+
+def _average(upper: Number, lower: Number) -> Number:
+    '''
+    Average of the two middle elements, halving them first: adding them could overflow small
+    fixed size types, like `numpy.int8`.
+    '''
+    return upper / 2 + lower / 2
+
+
+def _left_max(first: Sequence[Number], second: Sequence[Number], i: int, j: int) -> Number:
+    '''
+    Returns:
+        Number : The biggest element among `first[:i]` and `second[:j]`, which must not be both
+        empty.
+    '''
+    if not i:
+        return second[j - 1]
+    if not j:
+        return first[i - 1]
+    return max(first[i - 1], second[j - 1])
+
+
+def _right_min(first: Sequence[Number], second: Sequence[Number], i: int, j: int) -> Number:
+    '''
+    Returns:
+        Number : The smallest element among `first[i:]` and `second[j:]`, which must not be both
+        empty.
+    '''
+    if i == len(first):
+        return second[j]
+    if j == len(second):
+        return first[i]
+    return min(first[i], second[j])
+
+
+def _weighted_pivot(arrays: List[Sequence[Number]], lows: List[int], highs: List[int]) -> Number:
+    '''
+    Pick the pivot for `kth_smallest_many`: the median of the middle elements of the ranges, each
+    weighted by the size of its range. At least a quarter of the remaining elements is on each side.
+
+    Returns:
+        Number : The pivot, taken from a non-empty range.
+    '''
+    middles = sorted(
+        (a[(lo + hi) // 2], hi - lo) for a, lo, hi in zip(arrays, lows, highs) if lo < hi
+    )
+    half = sum(weight for _, weight in middles) / 2
+    total = 0
+    for value, weight in middles:
+        total += weight
+        if total >= half:
+            return value
@@ -108,16 +108,22 @@ class BinarySearchTree(Generic[T]):
             # Go to the left
             if value <= node.value:
                 if node.left is None:
-                    node.left = TreeNode(value)
+                    node.left = self._new_node(value)
                     break
                 node = node.left
             # Go to the right
             else:
                 if node.right is None:
-                    node.right = TreeNode(value)
+                    node.right = self._new_node(value)
                     break
                 node = node.right
 
+    def _new_node(self, value: T) -> TreeNode[T]:
+        '''
+        Create the node for an added value.
+        '''
+        return TreeNode(value)
+
     def remove(self, value: T) -> bool:
         '''
         Remove a value, looking it up with the bst criteria.
@@ -0,0 +1,258 @@
+'''
+**Question**: Implement a faster Priority Queue for small integer priorities that never go back,
+like the distances in Dijkstra's algorithm or timer deadlines.
+
+**Explanation**: A binary Heap works with any comparable priority, but pays `O(log(n))` comparisons
+for every operation. When priorities are non-negative integers, and are never smaller than the last
+extracted one (the queue is *monotone*), there are simpler structures. Both are Min Priority Queues,
+the element with the lowest priority is extracted first.
+
+A *Bucket Queue* keeps a list of items for each priority value. Pushing appends to the bucket of
+the priority, `O(1)`. Popping scans the buckets from the last extracted priority until a non empty
+one is found: since priorities only grow, the scan never goes back, and all the pops together scan
+each bucket once. It is great when the range of priorities `C` is small.
+
+A *Radix Heap* needs only `O(log(C))` buckets. Bucket `i` holds the items whose priority differs
+from the last extracted one starting from bit `i` (i.e. `(priority XOR last).bit_length() == i`),
+bucket `0` holds the ones equal to it. Pushing is `O(1)`. Popping takes from bucket `0`, and if it
+is empty finds the first non empty bucket, takes its minimum as new last priority and moves its items
+to lower buckets. Every item can only move to lower buckets, at most `O(log(C))` times, so pops are
+`O(log(C))` amortized.
+'''
+
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import operator
+
+from typing import Any, List, Tuple
+
+from .priority_queue import PriorityQueue
+
+
+class MonotoneMinPQ(PriorityQueue):
+
+    '''
+    Base class for the Min Priority Queues with non-negative integer priorities that are never
+    lower than the last extracted one. Peeking at an item counts as extracting its priority.
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self._size = 0
+        self._last = 0
+
+    def _check(self, priority: int) -> int:
+        '''
+        Returns:
+            int : The priority as a Python int (e.g. from NumPy integers).
+
+        Raises:
+            TypeError : if the priority is not an integer.
+            ValueError : if the priority is lower than the last extracted priority.
+        '''
+        try:
+            priority = operator.index(priority)
+        except TypeError:
+            raise TypeError(f"Priority must be an integer, not {type(priority).__name__}.")
+        if priority < self._last:
+            raise ValueError(
+                f"Priority {priority} is lower than the last extracted priority {self._last}."
+            )
+        return priority
+
+    def __bool__(self):
+        '''
+        A Queue is `False` if it's empty and `True` otherwise.
+        '''
+        return bool(self._size)
+
+    def __len__(self):
+        '''
+        The number of items in the Queue.
+        '''
+        return self._size
+
+
+class BucketMinPQ(MonotoneMinPQ):
+
+    '''
+    Bucket Queue: one bucket per priority, `O(1)` push and pops scanning the buckets forward.
+    Memory is proportional to the range of the priorities in the Queue, which is bounded by
+    `max_range`.
+    '''
+
+    def __init__(self, max_range: int = 2 ** 20):
+        '''
+        Parameters:
+            max_range : int
+                Maximum difference between a pushed priority and the last extracted one.
+
+        Raises:
+            ValueError : if max_range is not positive.
+        '''
+        if max_range < 1:
+            raise ValueError("Maximum range must be positive.")
+
+        super().__init__()
+        self.max_range = max_range
+        # self._array[i] is the bucket of priority self._offset + i.
+        self._offset = 0
+
+    def push(self, priority: int, item: Any):
+        '''
+        Insert an item into the Queue.
+
+        Parameters:
+            priority : int
+                The priority for the inserted item, not lower than the last extracted priority.
+
+            item : Any
+                The item to insert into the Queue.
+
+        Raises:
+            TypeError : if the priority is not an integer.
+            ValueError : if the priority is lower than the last extracted priority, or more than
+            `max_range` above it.
+        '''
+        priority = self._check(priority)
+        if priority - self._last > self.max_range:
+            raise ValueError(
+                f"Priority {priority} is more than {self.max_range} above the last extracted "
+                f"priority {self._last}."
+            )
+        index = priority - self._offset
+        if index >= len(self._array):
+            self._array.extend([] for _ in range(index - len(self._array) + 1))
+        self._array[index].append(item)
+        self._size += 1
+
+    def pop(self) -> Any:
+        '''
+        Remove an item from the Queue and return it.
+
+        Returns:
+            The item in the Queue with the lowest priority.
+        '''
+        index = self._first()
+        self._size -= 1
+        item = self._array[index].pop()
+        # Drop the buckets before the current one once they are half of the list.
+        if index > len(self._array) // 2:
+            del self._array[:index]
+            self._offset += index
+        return item
+
+    def peek(self) -> Any:
+        '''
+        Return the item with the lowest priority without removing it.
+
+        Returns:
+            The item in the Queue with the lowest priority.
+        '''
+        return self._array[self._first()][-1]
+
+    def _first(self) -> int:
+        '''
+        Returns:
+            int : Index of the first non empty bucket, also updating the last priority.
+        '''
+        if not self:
+            raise Exception("Empty Queue.")
+
+        index = self._last - self._offset
+        while not self._array[index]:
+            index += 1
+        self._last = self._offset + index
+        return index
+
+    def __iter__(self):
+        '''
+        Return the Queue as a sorted Iterable.
+        '''
+        for bucket in self._array:
+            yield from reversed(bucket)
+
+
+class RadixHeapMinPQ(MonotoneMinPQ):
+
+    '''
+    Radix Heap: `O(log(C))` buckets, `O(1)` push and `O(log(C))` amortized pop, where `C` is the
+    range of the priorities.
+    '''
+
+    def push(self, priority: int, item: Any):
+        '''
+        Insert an item into the Queue.
+
+        Parameters:
+            priority : int
+                The priority for the inserted item, not lower than the last extracted priority.
+
+            item : Any
+                The item to insert into the Queue.
+
+        Raises:
+            TypeError : if the priority is not an integer.
+            ValueError : if the priority is lower than the last extracted priority.
+        '''
+        priority = self._check(priority)
+        self._bucket((priority ^ self._last).bit_length()).append((priority, item))
+        self._size += 1
+
+    def pop(self) -> Any:
+        '''
+        Remove an item from the Queue and return it.
+
+        Returns:
+            The item in the Queue with the lowest priority.
+        '''
+        self._refill()
+        self._size -= 1
+        return self._array[0].pop()[1]
+
+    def peek(self) -> Any:
+        '''
+        Return the item with the lowest priority without removing it.
+
+        Returns:
+            The item in the Queue with the lowest priority.
+        '''
+        self._refill()
+        return self._array[0][-1][1]
+
+    def _bucket(self, index: int) -> List[Tuple[int, Any]]:
+        '''
+        Returns:
+            List[Tuple[int, Any]] : The bucket with the given index, created if needed.
+        '''
+        if index >= len(self._array):
+            self._array.extend([] for _ in range(index - len(self._array) + 1))
+        return self._array[index]
+
+    def _refill(self):
+        '''
+        Ensure bucket 0 is not empty, redistributing the first non empty bucket.
+        '''
+        if not self:
+            raise Exception("Empty Queue.")
+        if self._bucket(0):
+            return
+
+        index = 1
+        while not self._array[index]:
+            index += 1
+        bucket = self._array[index]
+        self._array[index] = []
+        self._last = min(priority for priority, _ in bucket)
+        # Every item goes to a lower bucket, relative to the new last priority.
+        for priority, item in bucket:
+            self._array[(priority ^ self._last).bit_length()].append((priority, item))
+
+    def __iter__(self):
+        '''
+        Return the Queue as a sorted Iterable.
+        '''
+        for priority, item in sorted(
+            (entry for bucket in self._array for entry in reversed(bucket)), key=lambda e: e[0]
+        ):
+            yield item
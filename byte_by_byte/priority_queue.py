@@ -57,12 +57,27 @@ class PriorityQueue(Iterable[Any]):
         '''
         raise NotImplementedError("This is an Abstract class, please extend it.")
 
+    def peek(self) -> Any:
+        '''
+        Return the item with the highest priority without removing it.
+
+        Returns:
+            The item in the Queue with the highest priority.
+        '''
+        raise NotImplementedError("This is an Abstract class, please extend it.")
+
     def __bool__(self):
         '''
         A Queue is `False` if it's empty and `True` otherwise.
         '''
         return bool(self._array)
 
+    def __len__(self):
+        '''
+        The number of items in the Queue.
+        '''
+        return len(self._array)
+
 
 class ArrayMaxPQ(PriorityQueue):
 
@@ -102,6 +117,15 @@ class ArrayMaxPQ(PriorityQueue):
         del self._array[-1]
         return value[1]
 
+    def peek(self) -> Any:
+        '''
+        Return the item with the highest priority without removing it.
+
+        Returns:
+            The item in the Queue with the highest priority.
+        '''
+        return self._array[-1][1]
+
     def _swap(self, i: int, j: int):
         '''
         Swap indices i, j in the list.
@@ -191,6 +215,18 @@ class HeapMaxPQ(PriorityQueue):
 
         return root[1]
 
+    def peek(self) -> Any:
+        '''
+        Return the item with the highest priority without removing it.
+
+        Returns:
+            The item in the Queue with the highest priority.
+        '''
+        if not self:
+            raise Exception("Empty Queue.")
+
+        return self._array[0][1]
+
     def _up(self, index: int) -> int:
         '''
         Find the index of the parent for the given index.
@@ -0,0 +1,302 @@
+'''
+**Question**: Find the median of a stream of numbers, updated every time a new number arrives.
+
+**Explanation**: Recomputing the median from scratch at every update takes at least `O(n)` time.
+Instead, the stream can be split into two halves: the smaller half is kept in a max Heap and the
+bigger half in a min Heap, with the sizes of the two halves differing by at most one. The median is
+then at the top of the heaps, and every new number costs a push and possibly moving one element from
+one Heap to the other, `O(log(n))` time.
+
+If only the last `w` numbers matter (sliding window), the numbers leaving the window should be
+removed from the heaps, but a Heap cannot efficiently remove an arbitrary element. The removal can be
+lazy: the size of the half the element belongs to is decreased, and the element is actually thrown
+away only when it reaches the top of its Heap. To keep memory bounded, the heaps are rebuilt from the
+window when they hold too many expired elements.
+
+For unbounded streams, where even `O(n)` memory is too much, the P² algorithm (Jain and Chlamtac)
+keeps an approximation of the median with five markers, whose heights are adjusted with a piecewise
+parabolic interpolation at every new number. It takes constant time and memory.
+'''
+
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+from bisect import insort
+from collections import deque
+from numbers import Real
+from typing import Tuple
+
+from .priority_queue import HeapMaxPQ
+
+
+class _Reversed():
+
+    '''
+    Priority comparing in reverse order, to use a Max Heap as a Min Heap. Negating the values
+    instead could overflow fixed size types, like `-numpy.int8(-128)`.
+    '''
+
+    __slots__ = ('key',)
+
+    def __init__(self, key: Tuple[Real, int]):
+        self.key = key
+
+    def __lt__(self, other: '_Reversed') -> bool:
+        return other.key < self.key
+
+    def __le__(self, other: '_Reversed') -> bool:
+        return other.key <= self.key
+
+    def __gt__(self, other: '_Reversed') -> bool:
+        return other.key > self.key
+
+    def __ge__(self, other: '_Reversed') -> bool:
+        return other.key >= self.key
+
+    def __eq__(self, other: '_Reversed') -> bool:
+        return self.key == other.key
+
+
+class RunningMedian():
+
+    '''
+    Exact median of a stream, optionally restricted to a sliding window of the last numbers.
+    Every update takes `O(log(n))` amortized time.
+    '''
+
+    def __init__(self, window: int = None):
+        '''
+        Parameters:
+            window : int
+                If given, only the last `window` numbers are considered.
+
+        Raises:
+            ValueError : if window is not positive.
+        '''
+        if window is not None and window < 1:
+            raise ValueError("Window must be positive.")
+
+        self._window = window
+        self._values = deque()
+        # Elements are (value, index in the stream), so that they are all different.
+        # Max Heap with the smaller half.
+        self._low = HeapMaxPQ()
+        # Min Heap with the bigger half, priorities compare in reverse.
+        self._high = HeapMaxPQ()
+        # Number of non expired elements in each heap.
+        self._low_size = 0
+        self._high_size = 0
+        self._count = 0
+
+    def add(self, value: Real):
+        '''
+        Add a new number from the stream.
+
+        Parameters:
+            value : Real
+                The new number.
+        '''
+        element = (value, self._count)
+        self._count += 1
+        if not self._low_size or element < self._low.peek():
+            self._push_low(element)
+            self._low_size += 1
+        else:
+            self._push_high(element)
+            self._high_size += 1
+
+        if self._window is not None:
+            self._values.append(element)
+            if len(self._values) > self._window:
+                self._expire(self._values.popleft())
+            if len(self._low) + len(self._high) > 2 * self._window:
+                self._rebuild()
+
+        self._balance()
+
+    def median(self) -> Real:
+        '''
+        Returns:
+            Real : The median of the numbers seen so far (or in the window).
+
+        Raises:
+            ValueError : if no number was added yet.
+        '''
+        if not self._low_size:
+            raise ValueError("Cannot compute the median of an empty stream.")
+
+        if self._low_size > self._high_size:
+            return self._low.peek()[0]
+        # Halved first, adding them could overflow small fixed size types.
+        return self._high.peek()[0] / 2 + self._low.peek()[0] / 2
+
+    def __len__(self):
+        '''
+        The number of numbers the median is computed on.
+        '''
+        return self._low_size + self._high_size
+
+    def _push_low(self, element: Tuple[Real, int]):
+        self._low.push(element, element)
+
+    def _push_high(self, element: Tuple[Real, int]):
+        self._high.push(_Reversed(element), element)
+
+    def _expired(self, element: Tuple[Real, int]) -> bool:
+        '''
+        Returns:
+            bool : Whether the element is out of the window.
+        '''
+        return self._window is not None and element[1] < self._count - self._window
+
+    def _expire(self, element: Tuple[Real, int]):
+        '''
+        Lazily remove an element leaving the window: only the size of its half is updated.
+        '''
+        if self._low_size and element <= self._low.peek():
+            self._low_size -= 1
+            self._prune(self._low)
+        else:
+            self._high_size -= 1
+            self._prune(self._high)
+
+    def _prune(self, heap: HeapMaxPQ):
+        '''
+        Throw away the expired elements at the top of the heap.
+        '''
+        while heap and self._expired(heap.peek()):
+            heap.pop()
+
+    def _balance(self):
+        '''
+        Move the top of one Heap to the other until the sizes of the halves differ by at most one,
+        with the smaller half being the bigger one if they differ.
+        '''
+        while self._low_size > self._high_size + 1:
+            self._push_high(self._low.pop())
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low)
+        while self._low_size < self._high_size:
+            self._push_low(self._high.pop())
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high)
+
+    def _rebuild(self):
+        '''
+        Build the heaps again from the window, dropping all the expired elements.
+        '''
+        ordered = sorted(self._values)
+        self._low_size = (len(ordered) + 1) // 2
+        self._high_size = len(ordered) - self._low_size
+        self._low = HeapMaxPQ()
+        self._high = HeapMaxPQ()
+        for element in ordered[:self._low_size]:
+            self._push_low(element)
+        for element in ordered[self._low_size:]:
+            self._push_high(element)
+
+
+class ApproximateRunningMedian():
+
+    '''
+    Approximate median of an unbounded stream using the P² algorithm, in constant time and memory
+    per update. Exact until five numbers have been seen.
+    '''
+
+    # Desired marker positions grow by these amounts at every new number, for the median.
+    _INCREMENTS = (0, 0.25, 0.5, 0.75, 1)
+
+    def __init__(self):
+        # Marker heights, the first five numbers until initialized.
+        self._heights = list()
+        # Actual and desired marker positions, starting from 1.
+        self._positions = [1, 2, 3, 4, 5]
+        self._desired = [1, 2, 3, 4, 5]
+        self._count = 0
+
+    def add(self, value: Real):
+        '''
+        Add a new number from the stream.
+
+        Parameters:
+            value : Real
+                The new number.
+        '''
+        self._count += 1
+        heights = self._heights
+        if self._count <= 5:
+            insort(heights, value)
+            return
+
+        # Find the cell containing the value, extending the extremes if needed.
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        for i in range(cell + 1, 5):
+            self._positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._INCREMENTS[i]
+
+        # Adjust the middle markers if they are off their desired position.
+        positions = self._positions
+        for i in range(1, 4):
+            offset = self._desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                positions[i] += step
+
+    def median(self) -> Real:
+        '''
+        Returns:
+            Real : The approximate median of the numbers seen so far.
+
+        Raises:
+            ValueError : if no number was added yet.
+        '''
+        if not self._count:
+            raise ValueError("Cannot compute the median of an empty stream.")
+
+        if self._count >= 5:
+            return self._heights[2]
+        size = self._count
+        middle = self._heights[size // 2]
+        return middle if size % 2 else (middle + self._heights[size // 2 - 1]) / 2
+
+    def __len__(self):
+        '''
+        The number of numbers seen so far.
+        '''
+        return self._count
+
+    def _parabolic(self, i: int, step: int) -> Real:
+        '''
+        Piecewise parabolic prediction of the height of marker `i` moved by `step`.
+        '''
+        q = self._heights
+        n = self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+            (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> Real:
+        '''
+        Linear prediction of the height of marker `i` moved by `step`.
+        '''
+        q = self._heights
+        n = self._positions
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
@@ -1,14 +1,18 @@
 __author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
 
 import numpy
+import tempfile
 import unittest
 
+from pathlib import Path
 from numbers import Number
 from typing import Sequence
 from numpy.random import rand
 from parameterized import parameterized
 
-from byte_by_byte.array_median import median
+from byte_by_byte.array_median import median, median_merge, median_batch, kth_smallest
+from byte_by_byte.array_median import median_many, quantiles_many, kth_smallest_many
+from byte_by_byte.array_median import open_sorted_file
 
 
 class TestArrayMedian(unittest.TestCase):
@@ -35,3 +39,181 @@ class TestArrayMedian(unittest.TestCase):
         second.sort()
 
         self.assertEqual(median(first, second), numpy.median(first + second))
+
+    @parameterized.expand([
+        [n, m] for n in (0, 1, 2, 3, 10, 57) for m in (0, 1, 2, 5, 64, 101) if n + m
+    ])
+    def test_median_against_merge(self, n: int, m: int):
+        '''
+        Compares the binary search `median` to the merging reference on random inputs.
+
+        Parameters:
+            n : int
+                Size of the first array.
+
+            m : int
+                Size of the second array.
+        '''
+        for _ in range(10):
+            first = sorted(rand(n))
+            second = sorted(rand(m))
+            self.assertEqual(median(first, second), median_merge(first, second))
+
+    @parameterized.expand([
+        [n, m] for n in (0, 1, 4, 13) for m in (1, 3, 20)
+    ])
+    def test_median_repeated_values(self, n: int, m: int):
+        '''
+        Same as `test_median_against_merge` with many duplicates among and across the arrays.
+        '''
+        for _ in range(10):
+            first = sorted(numpy.random.randint(0, 4, n))
+            second = sorted(numpy.random.randint(0, 4, m))
+            self.assertEqual(median(first, second), median_merge(first, second))
+
+    @parameterized.expand([[0, 7], [7, 0], [15, 16], [100, 3]])
+    def test_kth_smallest(self, n: int, m: int):
+        '''
+        Every index of the sorted union must match the merged array, NumPy arrays as input.
+        '''
+        first = numpy.sort(rand(n))
+        second = numpy.sort(rand(m))
+        merged = numpy.sort(numpy.concatenate((first, second)))
+        for k in range(n + m):
+            self.assertEqual(kth_smallest(first, second, k), merged[k])
+        self.assertEqual(median(first, second), numpy.median(merged))
+
+    @parameterized.expand([[numpy.int8], [numpy.uint8], [numpy.int16], [numpy.int64]])
+    def test_small_integer_types(self, dtype: type):
+        '''
+        The two middle elements are averaged without overflowing their type.
+        '''
+        info = numpy.iinfo(dtype)
+        first = numpy.array([info.max - 27], dtype=dtype)
+        second = numpy.array([info.max - 7], dtype=dtype)
+        expected = int(info.max) - 17
+        self.assertEqual(median(first, second), expected)
+        self.assertEqual(median_merge(first, second), expected)
+        self.assertEqual(median_many([first, second]), expected)
+        self.assertEqual(median_batch(first[None, :], second[None, :])[0], expected)
+        # The extremes of the type, interpolated halfway (int64 extremes are rounded as floats).
+        extremes = [numpy.array([info.min], dtype=dtype), numpy.array([info.max], dtype=dtype)]
+        numpy.testing.assert_allclose(
+            quantiles_many(extremes, [0.5]), [(int(info.min) + int(info.max)) / 2], atol=1
+        )
+        self.assertEqual(quantiles_many(extremes, [0.5]), [median_many(extremes)])
+
+    def test_errors(self):
+        '''
+        Empty inputs and out of range indexes are rejected.
+        '''
+        with self.assertRaises(ValueError):
+            median([], [])
+        with self.assertRaises(IndexError):
+            kth_smallest([1, 2], [3], 3)
+        with self.assertRaises(IndexError):
+            kth_smallest([1, 2], [3], -1)
+
+
+class TestArrayMedianMany(unittest.TestCase):
+
+    @parameterized.expand([
+        [sizes] for sizes in (
+            [1], [0, 5], [3, 3, 3], [10, 0, 1, 7], [100, 2, 50, 0, 33, 1], [17] * 24
+        )
+    ])
+    def test_median_many(self, sizes: Sequence[int]):
+        '''
+        Compares `median_many` and `quantiles_many` to `numpy` on the concatenated arrays.
+
+        Parameters:
+            sizes : Sequence[int]
+                The size of each of the arrays.
+        '''
+        for generate in (rand, lambda size: numpy.random.randint(0, 5, size)):
+            arrays = [numpy.sort(generate(size)) for size in sizes]
+            merged = numpy.concatenate(arrays)
+            qs = [0, 0.1, 0.25, 0.5, 0.9, 1]
+            self.assertEqual(median_many(arrays), numpy.median(merged))
+            numpy.testing.assert_allclose(quantiles_many(arrays, qs), numpy.quantile(merged, qs))
+            merged.sort()
+            for k in range(len(merged)):
+                self.assertEqual(kth_smallest_many(arrays, k), merged[k])
+
+    def test_sorted_files(self):
+        '''
+        Memory-mapped files behave like the in-memory arrays.
+        '''
+        arrays = [numpy.sort(rand(size)) for size in (0, 10, 123, 64)]
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [Path(directory, f"shard_{i}.bin") for i in range(len(arrays))]
+            for array, path in zip(arrays, paths):
+                array.tofile(path)
+            shards = [open_sorted_file(path) for path in paths]
+            self.assertEqual(median_many(shards), numpy.median(numpy.concatenate(arrays)))
+            del shards
+
+    def test_errors(self):
+        '''
+        Empty inputs, out of range indexes and quantiles are rejected.
+        '''
+        with self.assertRaises(ValueError):
+            median_many([[], []])
+        with self.assertRaises(ValueError):
+            quantiles_many([[]], [0.5])
+        with self.assertRaises(ValueError):
+            quantiles_many([[1]], [1.5])
+        with self.assertRaises(IndexError):
+            kth_smallest_many([[1, 2], [3]], 3)
+
+
+class TestArrayMedianBatch(unittest.TestCase):
+
+    @parameterized.expand([
+        [200, 0, 5], [200, 1, 1], [200, 7, 9], [50, 64, 3], [20, 100, 100]
+    ])
+    def test_median_batch(self, batch: int, columns_first: int, columns_second: int):
+        '''
+        Compares `median_batch` to `median` called on each pair, with random lengths and padding.
+
+        Parameters:
+            batch : int
+                Number of pairs.
+
+            columns_first : int
+                Padded size of the first arrays.
+
+            columns_second : int
+                Padded size of the second arrays.
+        '''
+        first = numpy.sort(rand(batch, columns_first), axis=1)
+        second = numpy.sort(numpy.random.randint(0, 3, (batch, columns_second)), axis=1)
+        first_lengths = numpy.random.randint(0, columns_first + 1, batch)
+        second_lengths = numpy.random.randint(1, columns_second + 1, batch)
+        # Padding must be ignored, whatever it is.
+        for row in range(batch):
+            first[row, first_lengths[row]:] = -1
+        expected = [
+            median(first[row, :first_lengths[row]], second[row, :second_lengths[row]])
+            for row in range(batch)
+        ]
+        result = median_batch(first, second, first_lengths, second_lengths)
+        numpy.testing.assert_array_equal(result, expected)
+        if columns_first:
+            numpy.testing.assert_array_equal(
+                median_batch(first[:, :1], second),
+                [median(first[row, :1], second[row]) for row in range(batch)]
+            )
+
+    def test_errors(self):
+        '''
+        Wrong shapes or lengths, and empty pairs are rejected.
+        '''
+        with self.assertRaises(ValueError):
+            median_batch(numpy.zeros(3), numpy.zeros(3))
+        with self.assertRaises(ValueError):
+            median_batch(numpy.zeros((3, 2)), numpy.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            median_batch(numpy.zeros((2, 2)), numpy.zeros((2, 2)), [1, 3])
+        with self.assertRaises(ValueError):
+            median_batch(numpy.zeros((2, 2)), numpy.zeros((2, 2)), [0, 1], [0, 1])
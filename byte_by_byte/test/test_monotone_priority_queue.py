@@ -0,0 +1,100 @@
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import heapq
+import numpy
+import unittest
+
+from numpy.random import randint
+from parameterized import parameterized, parameterized_class
+
+from ..monotone_priority_queue import BucketMinPQ, RadixHeapMinPQ
+
+
+@parameterized_class(("pq_class",), [
+    (BucketMinPQ,),
+    (RadixHeapMinPQ,)
+])
+class TestMonotonePriorityQueue(unittest.TestCase):
+
+    def setUp(self):
+        '''
+        Create the Queue.
+        '''
+        self.queue = self.pq_class()
+
+    @parameterized.expand([[10, 5], [1000, 10], [1000, 1000]])
+    def test_monotone_workload(self, operations: int, span: int):
+        '''
+        Interleaved pushes and pops, pushing priorities up to `span` above the last popped one, like
+        Dijkstra's algorithm does. Compared with `heapq`.
+
+        Parameters:
+            operations : int
+                Number of pushes.
+
+            span : int
+                Maximum difference between a pushed priority and the last popped one.
+        '''
+        self._check_workload(operations, span)
+
+    def _check_workload(self, operations: int, span: int):
+        '''
+        Run the workload of `test_monotone_workload`, with NumPy integer priorities.
+        '''
+        reference = list()
+        last = 0
+        for i in range(operations):
+            priority = last + randint(0, span)
+            self.queue.push(priority, (priority, i))
+            heapq.heappush(reference, (priority, i))
+            self.assertEqual(len(self.queue), len(reference))
+            if randint(0, 3) == 0:
+                item = self.queue.pop()
+                self.assertEqual(item[0], heapq.heappop(reference)[0])
+                last = item[0]
+
+        self.assertListEqual([p for p, _ in self.queue], sorted(p for p, _ in reference))
+        while self.queue:
+            self.assertEqual(self.queue.peek()[0], reference[0][0])
+            self.assertEqual(self.queue.pop()[0], heapq.heappop(reference)[0])
+        self.assertFalse(reference)
+
+    def test_wide_range(self):
+        '''
+        Radix Heaps handle huge ranges of priorities, Bucket Queues reject them.
+        '''
+        if self.pq_class is BucketMinPQ:
+            with self.assertRaises(ValueError):
+                self.queue.push(2 ** 40, 'a')
+            with self.assertRaises(ValueError):
+                BucketMinPQ(max_range=0)
+            return
+
+        self._check_workload(200, 2 ** 40)
+
+    def test_integer_types(self):
+        '''
+        Any integer type is accepted and stored as a Python int.
+        '''
+        self.queue.push(numpy.int64(3), 'a')
+        self.queue.push(numpy.uint8(2), 'b')
+        self.queue.push(True, 'c')
+        self.assertListEqual([self.queue.pop() for _ in range(3)], ['c', 'b', 'a'])
+        self.assertIs(type(self.queue._last), int)
+
+    def test_errors(self):
+        '''
+        Non monotone, negative and non integer priorities are rejected, empty queues raise.
+        '''
+        self.queue.push(5, 'a')
+        self.queue.push(7, 'b')
+        self.assertEqual(self.queue.pop(), 'a')
+        with self.assertRaises(ValueError):
+            self.queue.push(4, 'c')
+        with self.assertRaises(TypeError):
+            self.queue.push(8.5, 'c')
+        with self.assertRaises(ValueError):
+            self.pq_class().push(-1, 'd')
+        self.assertEqual(self.queue.pop(), 'b')
+        with self.assertRaises(Exception):
+            self.queue.pop()
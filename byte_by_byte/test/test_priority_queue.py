@@ -74,3 +74,28 @@ class TestPriorityQueue(unittest.TestCase):
         expected = [x[1] for x in reversed(sorted(items, key=lambda x: x[0]))]
 
         self.assertListEqual(result, expected)
+
+    @parameterized.expand([
+        (list(rand(10)), list(rand(10))),
+        (list(rand(100)), list(rand(100)))
+    ])
+    def test_peek(self, values: List, priorities: List):
+        '''
+        Ensure peek returns the item pop would return, without removing it.
+
+        Parameters:
+            values : List
+                The values to insert in the List.
+
+            priorities : List
+                The priorities. Only the first `len(values)` items will be used.
+        '''
+        for item in zip(priorities, values):
+            self.queue.push(*item)
+
+        while self.queue:
+            size = len(self.queue)
+            top = self.queue.peek()
+            self.assertEqual(len(self.queue), size)
+            self.assertEqual(self.queue.pop(), top)
+            self.assertEqual(len(self.queue), size - 1)
@@ -0,0 +1,93 @@
+__author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
+
+import numpy
+import unittest
+
+from typing import List
+from numpy.random import rand
+from parameterized import parameterized
+
+from byte_by_byte.running_median import RunningMedian, ApproximateRunningMedian
+
+
+class TestRunningMedian(unittest.TestCase):
+
+    @parameterized.expand([
+        [list(rand(1))],
+        [list(rand(100))],
+        [list(numpy.random.randint(0, 5, 100))],
+        [list(range(100))],
+        [list(range(100, 0, -1))],
+        # Sums of the middle elements overflow the type.
+        [list(numpy.array([100, 120, 127, 110, 125], dtype=numpy.int8))]
+    ])
+    def test_running_median(self, values: List):
+        '''
+        Compares the median after every update with `numpy.median` on the prefix of the stream.
+
+        Parameters:
+            values : List
+                The stream of numbers.
+        '''
+        running = RunningMedian()
+        for i, value in enumerate(values):
+            running.add(value)
+            self.assertEqual(len(running), i + 1)
+            self.assertEqual(running.median(), numpy.median(values[:i + 1]))
+
+    @parameterized.expand([
+        [list(rand(200)), window] for window in (1, 2, 7, 50)
+    ] + [
+        [list(numpy.random.randint(0, 5, 200)), window] for window in (1, 4, 9)
+    ] + [
+        [list(range(200)), 10], [list(range(200, 0, -1)), 11],
+        # The minimum of the type cannot be negated.
+        [list(numpy.array([-128, -128, 5, -128, 3, 127, -128, -1], dtype=numpy.int8)), 3],
+        [list(numpy.array([-128, -128, 5, -128, 3, 127, -128, -1], dtype=numpy.int8)), 4]
+    ])
+    def test_sliding_window(self, values: List, window: int):
+        '''
+        Compares the median after every update with `numpy.median` on the window.
+
+        Parameters:
+            values : List
+                The stream of numbers.
+
+            window : int
+                The size of the window.
+        '''
+        running = RunningMedian(window)
+        for i, value in enumerate(values):
+            running.add(value)
+            expected = values[max(0, i + 1 - window):i + 1]
+            self.assertEqual(len(running), len(expected))
+            self.assertEqual(running.median(), numpy.median(expected))
+            # Expired elements must not pile up.
+            self.assertLessEqual(len(running._low) + len(running._high), 2 * window + 1)
+
+    @parameterized.expand([[rand(10000)], [numpy.random.normal(5, 2, 10000)]])
+    def test_approximate(self, values: numpy.ndarray):
+        '''
+        The P² median must be close to the exact one.
+
+        Parameters:
+            values : numpy.ndarray
+                The stream of numbers.
+        '''
+        running = ApproximateRunningMedian()
+        for i, value in enumerate(values):
+            running.add(value)
+            if i < 5:
+                self.assertEqual(running.median(), numpy.median(values[:i + 1]))
+        self.assertAlmostEqual(running.median(), numpy.median(values), delta=numpy.std(values) / 20)
+
+    def test_errors(self):
+        '''
+        Empty streams have no median, windows must be positive.
+        '''
+        with self.assertRaises(ValueError):
+            RunningMedian().median()
+        with self.assertRaises(ValueError):
+            ApproximateRunningMedian().median()
+        with self.assertRaises(ValueError):
+            RunningMedian(0)
@@ -4,16 +4,22 @@ Add a readme.json file to customize readme file with:
 - title
 - description
 Otherwise module name and docstring are used.
+
+Docstrings are read with `ast`, nothing is imported. A hash of each package's sources and
+readme.json is stored in a cache file, and only the packages that changed are generated again.
 '''
 
 __author__ = "Riccardo De Zen <riccardodezen98@gmail.com>"
 
-import importlib
+import ast
+import hashlib
 import json
-from setuptools import find_packages
 from pkgutil import iter_modules
 from pathlib import Path
-from typing import Union, Set, Mapping, Iterable
+from typing import Union, Set, Mapping, Iterable, Dict
+
+CACHE_FILE = Path('.make_docs_cache.json')
+'''File storing the hash of each package the last time its readme was generated.'''
 
 
 class MarkdownDoc():
@@ -27,7 +33,14 @@ class MarkdownDoc():
         if isinstance(path, str):
             path = Path(path)
         self.output_file = path
-        self.content = ''
+        self._buffer = list()
+
+    @property
+    def content(self) -> str:
+        '''
+        The document's output so far.
+        '''
+        return ''.join(self._buffer)
 
     def paragraph(self, *paragraphs: Iterable[str]):
         '''
@@ -40,7 +53,7 @@ class MarkdownDoc():
                 appended two line finishes.
         '''
         for par in paragraphs:
-            self.content = self.content + "{}\n\n".format(par.strip())
+            self._buffer.append("{}\n\n".format(par.strip()))
 
     def header(self, title: str, weight: int = 1, bold: bool = False, italic: bool = False):
         '''
@@ -71,14 +84,14 @@ class MarkdownDoc():
         if bold:
             decoration = '**' + decoration + '**'
 
-        self.content = self.content + header + decoration.format(title.strip()) + '\n\n'
+        self._buffer.extend((header, decoration.format(title.strip()), '\n\n'))
 
     def write(self):
         '''
         Write the file to it's output destination.
         '''
         with self.output_file.open('w+') as output:
-            output.write(self.content)
+            output.writelines(self._buffer)
 
 
 def get_readme(package: str = '.') -> MarkdownDoc:
@@ -93,7 +106,6 @@ def get_readme(package: str = '.') -> MarkdownDoc:
         A MarkdownDoc for the package using the information on the readme.json file, if present.
         Otherwise, package name and docstring are used.
     '''
-    impored = importlib.import_module(package)
     package_path = package.replace('.', '/')
     config_path = Path(package_path, 'readme.json')
     document = MarkdownDoc(Path(package_path, 'README.md'))
@@ -104,10 +116,118 @@ def get_readme(package: str = '.') -> MarkdownDoc:
             config = json.load(config_file)
 
     document.header(config.get('title', module_to_header(package)), 1)
-    document.paragraph(config.get('description', impored.__doc__ or ''))
+    document.paragraph(config.get('description', get_docstring(package)))
     return document
 
 
+def module_path(name: str) -> Path:
+    '''
+    Parameters:
+        name : str
+            Absolute name of a package or module.
+
+    Returns:
+        Path : The source file of the module, `__init__.py` for packages.
+    '''
+    path = Path(*name.split('.'))
+    if path.is_dir():
+        return path / '__init__.py'
+    return path.with_suffix('.py')
+
+
+def get_docstring(name: str) -> str:
+    '''
+    Read the docstring of a package or module by parsing its source, without importing it.
+
+    Parameters:
+        name : str
+            Absolute name of a package or module.
+
+    Returns:
+        str : The docstring, empty if there is none.
+    '''
+    tree = ast.parse(module_path(name).read_bytes())
+    return ast.get_docstring(tree, clean=False) or ''
+
+
+def package_hash(package: str, modules: Iterable[str]) -> str:
+    '''
+    Parameters:
+        package : str
+            The package for which to compute the hash.
+
+        modules : Iterable[str]
+            The package's child modules.
+
+    Returns:
+        str : Hash of the sources of the package and its modules, of its readme.json and of this
+        script, so that changes to the generator also regenerate the READMEs.
+    '''
+    digest = hashlib.sha256()
+    paths = [module_path(m) for m in [package, *sorted(modules)]]
+    config_path = Path(package.replace('.', '/'), 'readme.json')
+    if config_path.exists():
+        paths.append(config_path)
+    paths.append(Path(__file__))
+    for path in paths:
+        digest.update(str(path).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def load_cache(path: Path = CACHE_FILE) -> Dict[str, str]:
+    '''
+    Parameters:
+        path : Path
+            The cache file.
+
+    Returns:
+        Dict[str, str] : Each package mapped to its hash, empty if the cache is missing or invalid.
+    '''
+    try:
+        with path.open() as cache_file:
+            return json.load(cache_file)
+    except (OSError, ValueError):
+        return dict()
+
+
+def save_cache(cache: Dict[str, str], path: Path = CACHE_FILE):
+    '''
+    Parameters:
+        cache : Dict[str, str]
+            Each package mapped to its hash.
+
+        path : Path
+            The cache file.
+    '''
+    with path.open('w+') as cache_file:
+        json.dump(cache, cache_file, indent=4, sort_keys=True)
+
+
+def find_packages(path: Union[str, Path] = '.') -> Set[str]:
+    '''
+    Find all the packages under a directory, without importing setuptools.
+
+    Parameters:
+        path : Union[str, Path]
+            The path in which to begin the search.
+
+    Returns:
+        Set[str] : The absolute names of the packages, directories with an `__init__.py` file whose
+        parents are packages too.
+    '''
+    root = Path(path)
+    packages = set()
+    pending = [d for d in root.iterdir() if d.is_dir()]
+    while pending:
+        directory = pending.pop()
+        if not (directory / '__init__.py').is_file() or '.' in directory.name:
+            continue
+        packages.add('.'.join(directory.relative_to(root).parts))
+        pending.extend(d for d in directory.iterdir() if d.is_dir())
+    return packages
+
+
 def get_all_modules(path: Union[str, Path] = '.') -> Set[str]:
     '''
     Retrieve the string names of all the modules found by searching recursively from a certain
@@ -122,7 +242,7 @@ def get_all_modules(path: Union[str, Path] = '.') -> Set[str]:
         found. You can immediately import them via importlib.
     '''
     modules = set()
-    for pkg in find_packages('.'):
+    for pkg in find_packages(path):
         modules.add(pkg)
         pkgpath = Path(path, pkg.replace('.', '/'))
         for info in iter_modules([pkgpath]):
@@ -179,14 +299,21 @@ if __name__ == "__main__":
     modules = get_all_modules()
     modules = no_test_modules(modules)
     grouped = group_modules(modules)
+    cache = load_cache()
 
     # Append each module's docstring.
-    for package, modules in grouped.items():
+    for package, modules in sorted(grouped.items()):
+        digest = package_hash(package, modules)
+        readme_path = Path(package.replace('.', '/'), 'README.md')
+        if cache.get(package) == digest and readme_path.exists():
+            continue
         document = get_readme(package)
-        for m in modules:
-            imported = importlib.import_module(m)
+        for m in sorted(modules):
             title = module_to_header(m)
-            content = imported.__doc__ or ''
+            content = get_docstring(m)
             document.header(title, 3, True)
             document.paragraph(content)
         document.write()
+        cache[package] = digest
+
+    save_cache(cache)